@@ -1,13 +1,30 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import reverse, get_script_prefix
 from django.utils.safestring import mark_safe
+from django.db.models import Count, Prefetch
+from functools import lru_cache
 from .models import (
     Building, Floor, Room, Tenant, Lease, RentPayment, 
     MeterReading, Invoice, InvoiceItem, Setting
 )
 
 
+_OBJECT_ID_PLACEHOLDER = '__object_id__'
+
+
+@lru_cache(maxsize=None)
+def _change_url_parts(viewname, script_prefix):
+    """Reverse an admin change URL once, split around the object id."""
+    return reverse(viewname, args=[_OBJECT_ID_PLACEHOLDER]).split(_OBJECT_ID_PLACEHOLDER)
+
+
+def change_url(viewname, object_id):
+    """Admin change URL for object_id without resolving the pattern per row."""
+    prefix, suffix = _change_url_parts(viewname, get_script_prefix())
+    return f'{prefix}{object_id}{suffix}'
+
+
 @admin.register(Building)
 class BuildingAdmin(admin.ModelAdmin):
     list_display = ['name', 'floor_count', 'room_count', 'created_at']
@@ -15,13 +32,21 @@ class BuildingAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     readonly_fields = ['created_at', 'updated_at']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _floor_count=Count('floors', distinct=True),
+            _room_count=Count('rooms', distinct=True),
+        )
+
     def floor_count(self, obj):
-        return obj.floors.count()
+        return obj._floor_count
     floor_count.short_description = 'Floors'
+    floor_count.admin_order_field = '_floor_count'
 
     def room_count(self, obj):
-        return obj.rooms.count()
+        return obj._room_count
     room_count.short_description = 'Rooms'
+    room_count.admin_order_field = '_room_count'
 
 
 @admin.register(Floor)
@@ -30,10 +55,15 @@ class FloorAdmin(admin.ModelAdmin):
     search_fields = ['building__name', 'floor_number']
     list_filter = ['building', 'created_at']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['building']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_room_count=Count('rooms'))
 
     def room_count(self, obj):
-        return obj.rooms.count()
+        return obj._room_count
     room_count.short_description = 'Rooms'
+    room_count.admin_order_field = '_room_count'
 
 
 @admin.register(Room)
@@ -42,12 +72,23 @@ class RoomAdmin(admin.ModelAdmin):
     search_fields = ['room_number', 'building__name', 'notes']
     list_filter = ['building', 'floor', 'status', 'created_at']
     readonly_fields = ['created_at', 'updated_at', 'history']
-    list_select_related = ['building', 'floor']
+    list_select_related = ['building', 'floor', 'floor__building']
+
+    def get_queryset(self, request):
+        # Prefetch the active lease once for the whole changelist instead of per row
+        return super().get_queryset(request).prefetch_related(
+            Prefetch(
+                'leases',
+                queryset=Lease.objects.filter(status='active').select_related('tenant'),
+                to_attr='active_leases_list'
+            )
+        )
 
     def current_tenant(self, obj):
-        active_lease = obj.leases.filter(status='active').first()
+        active_leases = getattr(obj, 'active_leases_list', None) or []
+        active_lease = active_leases[0] if active_leases else None
         if active_lease:
-            url = reverse('admin:core_tenant_change', args=[active_lease.tenant.id])
+            url = change_url('admin:core_tenant_change', active_lease.tenant_id)
             return format_html('<a href="{}">{}</a>', url, active_lease.tenant.full_name)
         return '-'
     current_tenant.short_description = 'Current Tenant'
@@ -60,10 +101,23 @@ class TenantAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     readonly_fields = ['created_at', 'updated_at', 'history']
 
+    def get_queryset(self, request):
+        # Prefetch the active lease (and the room it renders) for the whole changelist
+        return super().get_queryset(request).prefetch_related(
+            Prefetch(
+                'leases',
+                queryset=Lease.objects.filter(status='active').select_related(
+                    'room', 'room__building', 'room__floor'
+                ),
+                to_attr='active_leases_list'
+            )
+        )
+
     def active_lease(self, obj):
-        active_lease = obj.leases.filter(status='active').first()
+        active_leases = getattr(obj, 'active_leases_list', None) or []
+        active_lease = active_leases[0] if active_leases else None
         if active_lease:
-            url = reverse('admin:core_lease_change', args=[active_lease.id])
+            url = change_url('admin:core_lease_change', active_lease.id)
             return format_html('<a href="{}">{}</a>', url, active_lease.room)
         return '-'
     active_lease.short_description = 'Active Lease'
@@ -75,7 +129,7 @@ class LeaseAdmin(admin.ModelAdmin):
     search_fields = ['tenant__full_name', 'room__room_number', 'room__building__name']
     list_filter = ['status', 'start_date', 'created_at']
     readonly_fields = ['created_at', 'updated_at', 'history']
-    list_select_related = ['tenant', 'room', 'room__building']
+    list_select_related = ['tenant', 'room', 'room__building', 'room__floor']
 
     fieldsets = (
         ('Basic Information', {
@@ -101,7 +155,9 @@ class RentPaymentAdmin(admin.ModelAdmin):
     search_fields = ['lease__tenant__full_name', 'lease__room__room_number', 'method', 'notes']
     list_filter = ['paid_on', 'method', 'created_at']
     readonly_fields = ['created_at', 'updated_at']
-    list_select_related = ['lease', 'lease__tenant', 'lease__room']
+    list_select_related = [
+        'lease', 'lease__tenant', 'lease__room', 'lease__room__building', 'lease__room__floor'
+    ]
 
     fieldsets = (
         ('Payment Details', {
@@ -120,7 +176,7 @@ class MeterReadingAdmin(admin.ModelAdmin):
     search_fields = ['room__room_number', 'room__building__name']
     list_filter = ['reading_date', 'room__building', 'created_at']
     readonly_fields = ['created_at', 'updated_at', 'history']
-    list_select_related = ['room', 'room__building']
+    list_select_related = ['room', 'room__building', 'room__floor']
 
     fieldsets = (
         ('Reading Details', {
@@ -149,7 +205,7 @@ class InvoiceAdmin(admin.ModelAdmin):
     search_fields = ['room__room_number', 'room__building__name']
     list_filter = ['type', 'month', 'created_at']
     readonly_fields = ['created_at', 'updated_at', 'history']
-    list_select_related = ['room', 'room__building']
+    list_select_related = ['room', 'room__building', 'room__floor']
     inlines = [InvoiceItemInline]
 
     fieldsets = (
@@ -177,7 +233,9 @@ class InvoiceItemAdmin(admin.ModelAdmin):
     search_fields = ['invoice__room__room_number', 'label']
     list_filter = ['created_at']
     readonly_fields = ['created_at', 'updated_at']
-    list_select_related = ['invoice', 'invoice__room']
+    list_select_related = [
+        'invoice', 'invoice__room', 'invoice__room__building', 'invoice__room__floor'
+    ]
 
     fieldsets = (
         ('Item Details', {
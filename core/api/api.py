@@ -2,11 +2,20 @@ from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Count, Max, Prefetch, Value
+from django.db.models.functions import Cast, Concat
+from simple_history.utils import bulk_create_with_history
 from django.utils.dateparse import parse_date
+from django.utils.functional import cached_property
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 from decimal import Decimal, InvalidOperation
-from datetime import datetime, date
+from datetime import datetime
 import json
 
 from core.models import (
@@ -14,123 +23,437 @@ from core.models import (
     MeterReading, Invoice, InvoiceItem, Setting
 )
 from core.billing.electricity import (
-    calc_month_bill, validate_monotonic_readings, 
-    get_room_billing_summary
+    cached_month_bill, parse_month, month_bounds, load_room_readings, 
+    validate_monotonic_readings, get_room_billing_summary
 )
+from core.forms import TenantForm
+from core.signals import (
+    SETTING_LIST_CACHE_KEY, SETTING_CACHE_TIMEOUT, TABLE_VERSION_TIMEOUT,
+    table_version_cache_key
+)
+
+
+ZERO = Decimal('0')
+ONE = Decimal('1')
+
+
+def room_display_expression(room_path='room'):
+    """SQL expression producing the same text as Room.__str__ for the room at room_path."""
+    return Concat(
+        f'{room_path}__building__name',
+        Value(' - Floor '),
+        Cast(f'{room_path}__floor__floor_number', CharField()),
+        Value(' - Room '),
+        f'{room_path}__room_number',
+        output_field=CharField()
+    )
 
 
 # Serializers
-class BuildingSerializer(serializers.ModelSerializer):
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer that resolves its readable fields once per instance."""
+
+    # With many=True one child instance renders every row, so the filtered
+    # field list is built once instead of per object.
+    @cached_property
+    def _readable_fields(self):
+        return [field for field in self.fields.values() if not field.write_only]
+
+
+class RoomDisplayMixin:
+    """
+    Adds room_display, read from a room_display annotation when the queryset
+    provides one (see room_display_expression) and from Room.__str__ otherwise.
+    """
+    room_source = 'room'
+
+    def get_room_display(self, obj):
+        if hasattr(obj, 'room_display'):
+            return obj.room_display
+        room = obj
+        for attr in self.room_source.split('.'):
+            room = getattr(room, attr)
+        return str(room)
+
+
+class BuildingSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Building
-        fields = '__all__'
+        fields = ('id', 'name', 'created_at', 'updated_at')
 
 
-class FloorSerializer(serializers.ModelSerializer):
+class FloorSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Floor
-        fields = '__all__'
+        fields = ('id', 'floor_number', 'created_at', 'updated_at', 'building')
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(CachedFieldsModelSerializer):
     building_name = serializers.CharField(source='building.name', read_only=True)
     floor_number = serializers.IntegerField(source='floor.floor_number', read_only=True)
     current_tenant = serializers.SerializerMethodField()
 
     class Meta:
         model = Room
-        fields = '__all__'
+        fields = (
+            'id', 'building_name', 'floor_number', 'current_tenant', 'room_number', 'status',
+            'notes', 'created_at', 'updated_at', 'building', 'floor'
+        )
 
     def get_current_tenant(self, obj):
-        active_lease = obj.leases.filter(status='active').first()
+        # Use prefetched active leases when available to avoid a query per room
+        if hasattr(obj, 'active_leases_list'):
+            active_lease = obj.active_leases_list[0] if obj.active_leases_list else None
+        else:
+            active_lease = obj.leases.filter(status='active').select_related('tenant').first()
         if active_lease:
             return {
-                'id': active_lease.tenant.id,
+                'id': active_lease.tenant_id,
                 'name': active_lease.tenant.full_name,
                 'lease_id': active_lease.id
             }
         return None
 
 
-class TenantSerializer(serializers.ModelSerializer):
+class TenantSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Tenant
-        fields = '__all__'
+        fields = ('id', 'full_name', 'phone', 'email', 'id_proof_url', 'created_at', 'updated_at')
 
 
-class LeaseSerializer(serializers.ModelSerializer):
+class LeaseSerializer(RoomDisplayMixin, CachedFieldsModelSerializer):
     tenant_name = serializers.CharField(source='tenant.full_name', read_only=True)
-    room_display = serializers.CharField(source='room', read_only=True)
+    room_display = serializers.SerializerMethodField()
 
     class Meta:
         model = Lease
-        fields = '__all__'
+        fields = (
+            'id', 'tenant_name', 'room_display', 'start_date', 'end_date', 'monthly_rent',
+            'deposit', 'billing_day', 'status', 'created_at', 'updated_at', 'tenant', 'room'
+        )
 
     def validate(self, data):
-        if data.get('end_date') and data.get('start_date'):
-            if data['end_date'] <= data['start_date']:
-                raise serializers.ValidationError("End date must be after start date.")
+        end_date = data.get('end_date')
+        if not end_date:
+            return data
+        # Partial updates may carry only end_date; compare against the stored start
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        if start_date and end_date <= start_date:
+            raise serializers.ValidationError("End date must be after start date.")
         return data
 
 
-class RentPaymentSerializer(serializers.ModelSerializer):
+class RentPaymentSerializer(RoomDisplayMixin, CachedFieldsModelSerializer):
     tenant_name = serializers.CharField(source='lease.tenant.full_name', read_only=True)
-    room_display = serializers.CharField(source='lease.room', read_only=True)
+    room_display = serializers.SerializerMethodField()
+    room_source = 'lease.room'
 
     class Meta:
         model = RentPayment
-        fields = '__all__'
+        fields = (
+            'id', 'tenant_name', 'room_display', 'paid_on', 'amount', 'method', 'notes',
+            'created_at', 'updated_at', 'lease'
+        )
+
+
+MONOTONIC_READING_ERROR = "Reading value cannot be less than the previous reading for this room."
+UNIQUE_READING_ERROR = "The fields room, reading_date must make a unique set."
+CONCURRENT_READING_ERROR = (
+    "Another reading for one of these rooms and dates was saved at the same time. "
+    "No readings were saved; please retry."
+)
 
 
-class MeterReadingSerializer(serializers.ModelSerializer):
-    room_display = serializers.CharField(source='room', read_only=True)
+class MeterReadingSerializer(RoomDisplayMixin, CachedFieldsModelSerializer):
+    room_display = serializers.SerializerMethodField()
 
     class Meta:
         model = MeterReading
-        fields = '__all__'
+        fields = (
+            'id', 'room_display', 'reading_date', 'reading_value', 'created_at', 'updated_at', 'room'
+        )
+
+    def get_validators(self):
+        # meter_reading_bulk checks uniqueness against readings it preloads
+        if self.context.get('bulk'):
+            return []
+        return super().get_validators()
 
     def validate(self, data):
+        # meter_reading_bulk checks monotonicity against readings it preloads
+        if self.context.get('bulk'):
+            return data
+
         room = data.get('room')
         reading_date = data.get('reading_date')
         reading_value = data.get('reading_value')
 
         if room and reading_date and reading_value is not None:
             if not validate_monotonic_readings(room.id, reading_date, reading_value):
-                raise serializers.ValidationError(
-                    "Reading value cannot be less than the previous reading for this room."
-                )
+                raise serializers.ValidationError(MONOTONIC_READING_ERROR)
         return data
 
 
-class InvoiceItemSerializer(serializers.ModelSerializer):
+class InvoiceItemSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = InvoiceItem
-        fields = '__all__'
+        fields = ('id', 'label', 'qty', 'rate', 'amount')
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(RoomDisplayMixin, CachedFieldsModelSerializer):
     items = InvoiceItemSerializer(many=True, read_only=True)
-    room_display = serializers.CharField(source='room', read_only=True)
+    room_display = serializers.SerializerMethodField()
 
     class Meta:
         model = Invoice
-        fields = '__all__'
+        fields = (
+            'id', 'items', 'room_display', 'month', 'type', 'subtotal', 'tax', 'total',
+            'pdf_url', 'meta', 'created_at', 'updated_at', 'room'
+        )
 
 
-class SettingSerializer(serializers.ModelSerializer):
+class SettingSerializer(CachedFieldsModelSerializer):
     class Meta:
         model = Setting
-        fields = '__all__'
+        fields = ('key', 'value', 'created_at', 'updated_at')
+
+
+def rooms_with_active_lease():
+    """Room queryset with everything RoomSerializer reads joined or prefetched."""
+    return Room.objects.select_related('building', 'floor').prefetch_related(
+        Prefetch(
+            'leases',
+            queryset=Lease.objects.filter(status='active').select_related('tenant').only(
+                'id', 'room', 'tenant__full_name'
+            ),
+            to_attr='active_leases_list'
+        )
+    )
+
+
+def invoices_with_items():
+    """Invoice queryset with everything InvoiceSerializer reads joined or prefetched."""
+    return Invoice.objects.annotate(room_display=room_display_expression()).prefetch_related(
+        Prefetch(
+            'items',
+            # Order by id only: the default ('invoice', 'id') ordering joins back to invoice
+            queryset=InvoiceItem.objects.only(
+                'id', 'invoice_id', 'label', 'qty', 'rate', 'amount'
+            ).order_by('id')
+        )
+    )
+
+
+# Shared field instances used to format rows built from .values()
+datetime_field = serializers.DateTimeField()
+
+
+def building_values(buildings):
+    """The .values() rows serialize_buildings_fast renders."""
+    return buildings.values('id', 'name', 'created_at', 'updated_at')
+
+
+def serialize_buildings_fast(rows):
+    """Render building_values() rows as BuildingSerializer would."""
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+        }
+        for row in rows
+    ]
+
+
+def tenant_values(tenants):
+    """The .values() rows serialize_tenants_fast renders."""
+    return tenants.values(
+        'id', 'full_name', 'phone', 'email', 'id_proof_url', 'created_at', 'updated_at'
+    )
+
+
+def serialize_tenants_fast(rows):
+    """Render tenant_values() rows as TenantSerializer would."""
+    return [
+        {
+            'id': row['id'],
+            'full_name': row['full_name'],
+            'phone': row['phone'],
+            'email': row['email'],
+            'id_proof_url': row['id_proof_url'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+        }
+        for row in rows
+    ]
+
+
+def room_values(rooms):
+    """The .values() rows serialize_rooms_fast renders."""
+    return rooms.values(
+        'id', 'building__name', 'floor__floor_number', 'room_number', 'status',
+        'notes', 'created_at', 'updated_at', 'building_id', 'floor_id'
+    )
+
+
+def serialize_rooms_fast(rows):
+    """
+    Render room_values() rows as RoomSerializer would, without the serializer.
+
+    Stitches in the active tenant from one extra query keyed on room_id.
+    """
+    rows = list(rows)
+    active_leases = Lease.objects.filter(
+        status='active',
+        room_id__in=[row['id'] for row in rows]
+    ).values('id', 'room_id', 'tenant_id', 'tenant__full_name')
+    current_tenants = {
+        lease['room_id']: {
+            'id': lease['tenant_id'],
+            'name': lease['tenant__full_name'],
+            'lease_id': lease['id']
+        }
+        for lease in active_leases
+    }
+    return [
+        {
+            'id': row['id'],
+            'building_name': row['building__name'],
+            'floor_number': row['floor__floor_number'],
+            'current_tenant': current_tenants.get(row['id']),
+            'room_number': row['room_number'],
+            'status': row['status'],
+            'notes': row['notes'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+            'building': row['building_id'],
+            'floor': row['floor_id'],
+        }
+        for row in rows
+    ]
+
+
+def meter_reading_values(readings):
+    """The .values() rows serialize_meter_readings_fast renders."""
+    return readings.values(
+        'id', 'reading_date', 'reading_value', 'created_at', 'updated_at', 'room_id',
+        room_display=room_display_expression()
+    )
+
+
+def serialize_meter_readings_fast(rows):
+    """Render meter_reading_values() rows as MeterReadingSerializer would."""
+    return [
+        {
+            'id': row['id'],
+            'room_display': row['room_display'],
+            'reading_date': row['reading_date'].isoformat(),
+            'reading_value': str(row['reading_value']),
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+            'room': row['room_id'],
+        }
+        for row in rows
+    ]
+
+
+def invoice_values(invoices):
+    """The .values() rows serialize_invoices_fast renders."""
+    return invoices.values(
+        'id', 'month', 'type', 'subtotal', 'tax', 'total', 'pdf_url', 'meta',
+        'created_at', 'updated_at', 'room_id',
+        room_display=room_display_expression()
+    )
+
+
+def serialize_invoices_fast(rows):
+    """
+    Render invoice_values() rows as InvoiceSerializer would.
+
+    Stitches in the items from one extra query keyed on invoice_id.
+    """
+    rows = list(rows)
+    items_by_invoice = {row['id']: [] for row in rows}
+    for item in InvoiceItem.objects.filter(
+        invoice_id__in=items_by_invoice
+    ).order_by('id').values('id', 'invoice_id', 'label', 'qty', 'rate', 'amount'):
+        items_by_invoice[item['invoice_id']].append({
+            'id': item['id'],
+            'label': item['label'],
+            'qty': str(item['qty']),
+            'rate': str(item['rate']),
+            'amount': str(item['amount']),
+        })
+    return [
+        {
+            'id': row['id'],
+            'items': items_by_invoice[row['id']],
+            'room_display': row['room_display'],
+            'month': row['month'].isoformat(),
+            'type': row['type'],
+            'subtotal': str(row['subtotal']),
+            'tax': str(row['tax']),
+            'total': str(row['total']),
+            'pdf_url': row['pdf_url'],
+            'meta': row['meta'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+            'room': row['room_id'],
+        }
+        for row in rows
+    ]
+
+
+def paginate(request, queryset):
+    """
+    Paginate a queryset with the configured DEFAULT_PAGINATION_CLASS.
+
+    Returns (paginator, page); build the response with
+    paginator.get_paginated_response(data).
+    """
+    paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator, page
+
+
+def table_version(model):
+    """Fingerprint a table by its row count and latest updated_at."""
+    key = table_version_cache_key(model)
+    version = cache.get(key)
+    if version is None:
+        stats = model.objects.aggregate(count=Count('pk'), latest=Max('updated_at'))
+        latest = stats['latest'].timestamp() if stats['latest'] else 0
+        version = f"{stats['count']}.{latest}"
+        cache.set(key, version, TABLE_VERSION_TIMEOUT)
+    return version
+
+
+def list_etag(*models):
+    """
+    Build an etag_func for @condition from the versions of the tables a
+    list is rendered from, so an unchanged page is answered with a 304
+    before any rows are read or serialized.
+
+    The tag does not cover the renderer, so views using it also need
+    @vary_on_headers('Accept').
+    """
+    def etag_func(request, *args, **kwargs):
+        versions = '-'.join(table_version(model) for model in models)
+        return f'{versions}?{request.GET.urlencode()}'
+    return etag_func
 
 
 # API Views
+@cache_control(private=True, no_cache=True)
+@vary_on_headers('Accept')
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=list_etag(Building))
 def building_list(request):
     if request.method == 'GET':
-        buildings = Building.objects.all()
-        serializer = BuildingSerializer(buildings, many=True)
-        return Response(serializer.data)
+        paginator, page = paginate(request, building_values(Building.objects.all()))
+        return paginator.get_paginated_response(serialize_buildings_fast(page))
     
     elif request.method == 'POST':
         serializer = BuildingSerializer(data=request.data)
@@ -161,13 +484,17 @@ def building_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@cache_control(private=True, no_cache=True)
+@vary_on_headers('Accept')
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=list_etag(Floor))
 def floor_list(request):
     if request.method == 'GET':
         floors = Floor.objects.all()
-        serializer = FloorSerializer(floors, many=True)
-        return Response(serializer.data)
+        paginator, page = paginate(request, floors)
+        serializer = FloorSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
         serializer = FloorSerializer(data=request.data)
@@ -193,8 +520,8 @@ def room_list(request):
         if floor_id:
             rooms = rooms.filter(floor_id=floor_id)
         
-        serializer = RoomSerializer(rooms, many=True)
-        return Response(serializer.data)
+        paginator, page = paginate(request, room_values(rooms))
+        return paginator.get_paginated_response(serialize_rooms_fast(page))
     
     elif request.method == 'POST':
         serializer = RoomSerializer(data=request.data)
@@ -207,7 +534,7 @@ def room_list(request):
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def room_detail(request, pk):
-    room = get_object_or_404(Room, pk=pk)
+    room = get_object_or_404(rooms_with_active_lease(), pk=pk)
     
     if request.method == 'GET':
         serializer = RoomSerializer(room)
@@ -229,9 +556,8 @@ def room_detail(request, pk):
 @permission_classes([IsAuthenticated])
 def tenant_list(request):
     if request.method == 'GET':
-        tenants = Tenant.objects.all()
-        serializer = TenantSerializer(tenants, many=True)
-        return Response(serializer.data)
+        paginator, page = paginate(request, tenant_values(Tenant.objects.all()))
+        return paginator.get_paginated_response(serialize_tenants_fast(page))
     
     elif request.method == 'POST':
         serializer = TenantSerializer(data=request.data)
@@ -262,13 +588,33 @@ def tenant_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def tenant_validate(request):
+    """
+    Validate tenant form data without saving anything.
+    
+    Backs the tenant form's as-you-type checks, so they never reach the
+    tenant/lease write path.
+    """
+    form = TenantForm(data=request.data)
+    errors = {field: [str(message) for message in messages] for field, messages in form.errors.items()}
+    return Response({'valid': not errors, 'errors': errors})
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def lease_list(request):
     if request.method == 'GET':
-        leases = Lease.objects.all()
-        serializer = LeaseSerializer(leases, many=True)
-        return Response(serializer.data)
+        leases = Lease.objects.select_related('tenant').only(
+            'id', 'start_date', 'end_date', 'monthly_rent', 'deposit', 'billing_day',
+            'status', 'created_at', 'updated_at', 'room_id', 'tenant__full_name'
+        ).annotate(
+            room_display=room_display_expression()
+        )
+        paginator, page = paginate(request, leases)
+        serializer = LeaseSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
         serializer = LeaseSerializer(data=request.data)
@@ -281,7 +627,9 @@ def lease_list(request):
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def lease_detail(request, pk):
-    lease = get_object_or_404(Lease, pk=pk)
+    lease = get_object_or_404(
+        Lease.objects.select_related('tenant', 'room__building', 'room__floor'), pk=pk
+    )
     
     if request.method == 'GET':
         serializer = LeaseSerializer(lease)
@@ -303,9 +651,15 @@ def lease_detail(request, pk):
 @permission_classes([IsAuthenticated])
 def rent_payment_list(request):
     if request.method == 'GET':
-        payments = RentPayment.objects.all()
-        serializer = RentPaymentSerializer(payments, many=True)
-        return Response(serializer.data)
+        payments = RentPayment.objects.select_related('lease__tenant').only(
+            'id', 'paid_on', 'amount', 'method', 'notes', 'created_at', 'updated_at',
+            'lease__tenant__full_name'
+        ).annotate(
+            room_display=room_display_expression('lease__room')
+        )
+        paginator, page = paginate(request, payments)
+        serializer = RentPaymentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
         serializer = RentPaymentSerializer(data=request.data)
@@ -331,13 +685,7 @@ def meter_reading_list(request):
         month = request.query_params.get('month')
         if year and month:
             try:
-                year = int(year)
-                month = int(month)
-                first_of_month = date(year, month, 1)
-                if month == 12:
-                    first_of_next_month = date(year + 1, 1, 1)
-                else:
-                    first_of_next_month = date(year, month + 1, 1)
+                first_of_month, first_of_next_month = month_bounds(int(year), int(month))
                 readings = readings.filter(
                     reading_date__gte=first_of_month,
                     reading_date__lt=first_of_next_month
@@ -345,8 +693,8 @@ def meter_reading_list(request):
             except (ValueError, TypeError):
                 pass
         
-        serializer = MeterReadingSerializer(readings, many=True)
-        return Response(serializer.data)
+        paginator, page = paginate(request, meter_reading_values(readings))
+        return paginator.get_paginated_response(serialize_meter_readings_fast(page))
     
     elif request.method == 'POST':
         serializer = MeterReadingSerializer(data=request.data)
@@ -369,27 +717,70 @@ def meter_reading_bulk(request):
         )
     
     errors = []
-    created_readings = []
-    
-    with transaction.atomic():
-        for i, reading_data in enumerate(data):
-            serializer = MeterReadingSerializer(data=reading_data)
-            if serializer.is_valid():
-                try:
-                    reading = serializer.save()
-                    created_readings.append(reading)
-                except Exception as e:
-                    errors.append({
-                        'index': i,
-                        'error': str(e),
-                        'data': reading_data
-                    })
-            else:
-                errors.append({
-                    'index': i,
-                    'error': serializer.errors,
-                    'data': reading_data
-                })
+    serializers_by_index = []
+    
+    for i, reading_data in enumerate(data):
+        serializer = MeterReadingSerializer(data=reading_data, context={'bulk': True})
+        if serializer.is_valid():
+            serializers_by_index.append((i, serializer))
+        else:
+            errors.append({
+                'index': i,
+                'error': serializer.errors,
+                'data': reading_data
+            })
+    
+    # Load every existing reading for the rooms involved in one query, then
+    # run the uniqueness and monotonic checks in memory. Rows accepted earlier
+    # in the same request count as existing readings for the rows after them.
+    readings_by_room = load_room_readings(
+        serializer.validated_data['room'].id for _, serializer in serializers_by_index
+    )
+    
+    new_readings = []
+    for i, serializer in serializers_by_index:
+        validated = serializer.validated_data
+        room_id = validated['room'].id
+        reading_date = validated['reading_date']
+        
+        if reading_date in readings_by_room[room_id]:
+            error = UNIQUE_READING_ERROR
+        elif not validate_monotonic_readings(
+            room_id, reading_date, validated['reading_value'], readings_by_room
+        ):
+            error = MONOTONIC_READING_ERROR
+        else:
+            error = None
+        
+        if error:
+            errors.append({
+                'index': i,
+                'error': {'non_field_errors': [error]},
+                'data': data[i]
+            })
+            continue
+        
+        readings_by_room[room_id][reading_date] = validated['reading_value']
+        new_readings.append(MeterReading(**validated))
+    
+    errors.sort(key=lambda error: error['index'])
+    
+    try:
+        with transaction.atomic():
+            created_readings = bulk_create_with_history(
+                new_readings,
+                MeterReading,
+                batch_size=500,
+                default_user=request.user
+            )
+    except IntegrityError:
+        # A clashing reading was saved by another request after the readings
+        # above were loaded; the whole insert rolled back
+        return Response({
+            'error': CONCURRENT_READING_ERROR,
+            'created': 0,
+            'errors': errors
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     if errors:
         return Response({
@@ -397,9 +788,14 @@ def meter_reading_bulk(request):
             'errors': errors
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    # Reload the new rows in one query (with room_display annotated) rather than
+    # resolving each reading's room separately
+    created = MeterReading.objects.filter(
+        id__in=[reading.id for reading in created_readings]
+    ).order_by('id')
     return Response({
         'created': len(created_readings),
-        'readings': MeterReadingSerializer(created_readings, many=True).data
+        'readings': serialize_meter_readings_fast(meter_reading_values(created))
     }, status=status.HTTP_201_CREATED)
 
 
@@ -417,8 +813,8 @@ def electricity_bill_calc(request):
         )
     
     try:
-        year, month = map(int, month_str.split('-'))
-        result = calc_month_bill(room_id, year, month)
+        first_of_month = parse_month(month_str)
+        result = cached_month_bill(room_id, first_of_month.year, first_of_month.month)
         return Response(result)
     except ValueError as e:
         return Response(
@@ -441,24 +837,21 @@ def electricity_invoice_create(request):
         )
     
     try:
-        year, month = map(int, month_str.split('-'))
-        first_of_month = date(year, month, 1)
+        first_of_month = parse_month(month_str)
+        year, month = first_of_month.year, first_of_month.month
         
-        # Check if invoice already exists
-        existing_invoice = Invoice.objects.filter(
-            room_id=room_id,
-            month=first_of_month,
-            type='electricity'
+        # An existing invoice wins; its month may no longer bill cleanly
+        invoice = Invoice.objects.filter(
+            room_id=room_id, month=first_of_month, type='electricity'
         ).first()
-        
-        if existing_invoice:
+        if invoice:
             return Response({
                 'message': 'Invoice already exists',
-                'invoice': InvoiceSerializer(existing_invoice).data
+                'invoice': InvoiceSerializer(invoice).data
             })
         
         # Calculate bill
-        bill_data = calc_month_bill(room_id, year, month)
+        bill_data = cached_month_bill(room_id, year, month)
         
         if 'error' in bill_data:
             return Response(
@@ -466,31 +859,40 @@ def electricity_invoice_create(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create invoice
+        # Create invoice unless one already exists (unique on room/month/type)
         with transaction.atomic():
-            invoice = Invoice.objects.create(
+            invoice, created = Invoice.objects.get_or_create(
                 room_id=room_id,
                 month=first_of_month,
                 type='electricity',
-                subtotal=bill_data['total'],
-                tax=Decimal('0'),
-                total=bill_data['total'],
-                meta={
-                    'previous_reading': float(bill_data['previous_reading']) if bill_data['previous_reading'] else None,
-                    'current_reading': float(bill_data['current_reading']) if bill_data['current_reading'] else None,
-                    'units': float(bill_data['units']),
-                    'rate': float(bill_data['rate'])
+                defaults={
+                    'subtotal': bill_data['total'],
+                    'tax': ZERO,
+                    'total': bill_data['total'],
+                    'meta': {
+                        'previous_reading': float(bill_data['previous_reading']) if bill_data['previous_reading'] else None,
+                        'current_reading': float(bill_data['current_reading']) if bill_data['current_reading'] else None,
+                        'units': float(bill_data['units']),
+                        'rate': float(bill_data['rate'])
+                    }
                 }
             )
             
             # Create invoice item
-            InvoiceItem.objects.create(
-                invoice=invoice,
-                label=f"Electricity ({month_str}): prev {bill_data['previous_reading'] or 'N/A'}, curr {bill_data['current_reading'] or 'N/A'}, units {bill_data['units']} @ ₹{bill_data['rate']}",
-                qty=bill_data['units'],
-                rate=bill_data['rate'],
-                amount=bill_data['total']
-            )
+            if created:
+                InvoiceItem.objects.create(
+                    invoice=invoice,
+                    label=f"Electricity ({month_str}): prev {bill_data['previous_reading'] or 'N/A'}, curr {bill_data['current_reading'] or 'N/A'}, units {bill_data['units']} @ ₹{bill_data['rate']}",
+                    qty=bill_data['units'],
+                    rate=bill_data['rate'],
+                    amount=bill_data['total']
+                )
+        
+        if not created:
+            return Response({
+                'message': 'Invoice already exists',
+                'invoice': InvoiceSerializer(invoice).data
+            })
         
         return Response({
             'message': 'Invoice created successfully',
@@ -518,46 +920,46 @@ def rent_invoice_create(request):
         )
     
     try:
-        lease = get_object_or_404(Lease, id=lease_id)
-        year, month = map(int, month_str.split('-'))
-        first_of_month = date(year, month, 1)
-        
-        # Check if invoice already exists
-        existing_invoice = Invoice.objects.filter(
-            room=lease.room,
-            month=first_of_month,
-            type='rent'
-        ).first()
-        
-        if existing_invoice:
-            return Response({
-                'message': 'Invoice already exists',
-                'invoice': InvoiceSerializer(existing_invoice).data
-            })
+        # Join the room (and what Room.__str__ reads) for the invoice response
+        lease = get_object_or_404(
+            Lease.objects.select_related('room__building', 'room__floor'),
+            id=lease_id
+        )
+        rent = lease.monthly_rent
+        first_of_month = parse_month(month_str)
         
-        # Create invoice
+        # Create invoice unless one already exists (unique on room/month/type)
         with transaction.atomic():
-            invoice = Invoice.objects.create(
+            invoice, created = Invoice.objects.get_or_create(
                 room=lease.room,
                 month=first_of_month,
                 type='rent',
-                subtotal=lease.monthly_rent,
-                tax=Decimal('0'),
-                total=lease.monthly_rent,
-                meta={
-                    'lease_id': lease.id,
-                    'tenant_id': lease.tenant.id
+                defaults={
+                    'subtotal': rent,
+                    'tax': ZERO,
+                    'total': rent,
+                    'meta': {
+                        'lease_id': lease.id,
+                        'tenant_id': lease.tenant_id
+                    }
                 }
             )
             
             # Create invoice item
-            InvoiceItem.objects.create(
-                invoice=invoice,
-                label=f"Rent for {month_str}",
-                qty=Decimal('1'),
-                rate=lease.monthly_rent,
-                amount=lease.monthly_rent
-            )
+            if created:
+                InvoiceItem.objects.create(
+                    invoice=invoice,
+                    label=f"Rent for {month_str}",
+                    qty=ONE,
+                    rate=rent,
+                    amount=rent
+                )
+        
+        if not created:
+            return Response({
+                'message': 'Invoice already exists',
+                'invoice': InvoiceSerializer(invoice).data
+            })
         
         return Response({
             'message': 'Invoice created successfully',
@@ -586,9 +988,7 @@ def invoice_list(request):
     month = request.query_params.get('month')
     if month:
         try:
-            year, month_num = map(int, month.split('-'))
-            first_of_month = date(year, month_num, 1)
-            invoices = invoices.filter(month=first_of_month)
+            invoices = invoices.filter(month=parse_month(month))
         except (ValueError, TypeError):
             pass
     
@@ -597,27 +997,32 @@ def invoice_list(request):
     if invoice_type:
         invoices = invoices.filter(type=invoice_type)
     
-    serializer = InvoiceSerializer(invoices, many=True)
-    return Response(serializer.data)
+    paginator, page = paginate(request, invoice_values(invoices))
+    return paginator.get_paginated_response(serialize_invoices_fast(page))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def invoice_detail(request, pk):
     """Get invoice details."""
-    invoice = get_object_or_404(Invoice, pk=pk)
+    invoice = get_object_or_404(invoices_with_items(), pk=pk)
     serializer = InvoiceSerializer(invoice)
     return Response(serializer.data)
 
 
+@cache_control(private=True, no_cache=True)
+@vary_on_headers('Accept')
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=list_etag(Setting))
 def setting_list(request):
     """List or update settings."""
     if request.method == 'GET':
-        settings = Setting.objects.all()
-        serializer = SettingSerializer(settings, many=True)
-        return Response(serializer.data)
+        data = cache.get(SETTING_LIST_CACHE_KEY)
+        if data is None:
+            data = SettingSerializer(Setting.objects.all(), many=True).data
+            cache.set(SETTING_LIST_CACHE_KEY, data, SETTING_CACHE_TIMEOUT)
+        return Response(data)
     
     elif request.method == 'POST':
         key = request.data.get('key')
@@ -15,6 +15,7 @@ urlpatterns = [
     
     # Tenants
     path('tenants/', api.tenant_list, name='tenant-list'),
+    path('tenants/validate/', api.tenant_validate, name='tenant-validate'),
     path('tenants/<int:pk>/', api.tenant_detail, name='tenant-detail'),
     
     # Leases
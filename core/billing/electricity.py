@@ -1,17 +1,28 @@
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from datetime import date, datetime
 from typing import Optional, Dict, Any
-from django.db.models import Q
-from core.models import Setting, MeterReading, Room
+from django.core.cache import cache
+from django.db.models import Q, Max, Count, OuterRef, Prefetch, Subquery
+from core.models import Setting, MeterReading, Room, Lease
+from core.signals import ELECTRICITY_RATE_CACHE_KEY, SETTING_CACHE_TIMEOUT
+
+
+ZERO = Decimal('0')
+CENTS = Decimal('0.01')
 
 
 def get_rate() -> Decimal:
-    """Get electricity rate per unit from settings."""
-    rate_str = Setting.get_value('electricity_rate_per_unit', '0')
-    try:
-        return Decimal(rate_str)
-    except (ValueError, TypeError):
-        return Decimal('0')
+    """
+    Get electricity rate per unit from settings.
+    
+    The parsed rate is cached until a Setting is saved or deleted (see core.signals).
+    """
+    return cache.get_or_set(
+        ELECTRICITY_RATE_CACHE_KEY,
+        lambda: Setting.get_decimal('electricity_rate_per_unit', ZERO),
+        SETTING_CACHE_TIMEOUT
+    )
 
 
 def compute_units(previous: Optional[Decimal], current: Optional[Decimal]) -> Decimal:
@@ -29,10 +40,10 @@ def compute_units(previous: Optional[Decimal], current: Optional[Decimal]) -> De
         ValueError: If delta is negative
     """
     if previous is None:
-        return Decimal('0')
+        return ZERO
     
     if current is None:
-        return Decimal('0')
+        return ZERO
     
     delta = current - previous
     if delta < 0:
@@ -54,7 +65,7 @@ def compute_bill(previous_reading: Optional[Decimal], current_reading: Optional[
         Dict with units, rate, and total
     """
     units = compute_units(previous_reading, current_reading)
-    total = (units * rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    total = (units * rate).quantize(CENTS, rounding=ROUND_HALF_UP)
     
     return {
         'units': units,
@@ -63,47 +74,72 @@ def compute_bill(previous_reading: Optional[Decimal], current_reading: Optional[
     }
 
 
-def get_month_readings(room_id: int, year: int, month: int) -> tuple[Optional[Decimal], Optional[Decimal]]:
+@lru_cache(maxsize=256)
+def parse_month(month_str: str) -> date:
     """
-    Get previous and current readings for a specific month.
+    Parse a "YYYY-MM" string into the first day of that month.
     
-    Args:
-        room_id: Room ID
-        year: Year
-        month: Month (1-12)
-        
-    Returns:
-        Tuple of (previous_reading, current_reading)
-    """
-    first_of_month = date(year, month, 1)
+    Memoized: requests keep asking for the same handful of months.
     
-    # Get previous reading (latest reading before first of month)
-    previous_reading = MeterReading.objects.filter(
-        room_id=room_id,
-        reading_date__lt=first_of_month
-    ).order_by('-reading_date').first()
+    Raises:
+        ValueError: If the string is not a valid "YYYY-MM" month
+    """
+    year, month = map(int, month_str.split('-'))
+    return date(year, month, 1)
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    """
+    Get the half-open date range [first_of_month, first_of_next_month) for a month.
     
-    # Get current reading (latest reading in the month)
-    if month == 12:
-        first_of_next_month = date(year + 1, 1, 1)
-    else:
-        first_of_next_month = date(year, month + 1, 1)
+    Filtering on this range keeps reading_date lookups on the plain column so
+    they can use an index, unlike __year/__month which wrap it in EXTRACT().
     
-    current_reading = MeterReading.objects.filter(
-        room_id=room_id,
-        reading_date__gte=first_of_month,
-        reading_date__lt=first_of_next_month
-    ).order_by('-reading_date').first()
+    Raises:
+        ValueError: If year/month is not a valid date
+    """
+    first_of_month = date(year, month, 1)
+    # month // 12 carries December into January of the next year
+    first_of_next_month = date(year + month // 12, month % 12 + 1, 1)
+    return first_of_month, first_of_next_month
+
+
+def quantize_reading(value: Optional[Decimal]) -> Optional[Decimal]:
+    """
+    Restore reading_value's 2 decimal places on an annotated reading.
     
-    previous_value = previous_reading.reading_value if previous_reading else None
-    current_value = current_reading.reading_value if current_reading else None
+    SQLite only quantizes plain column values, so subquery annotations come
+    back as e.g. Decimal('90') instead of Decimal('90.00').
+    """
+    return value.quantize(CENTS) if value is not None else None
+
+
+def with_month_readings(rooms, year: int, month: int):
+    """
+    Annotate a Room queryset with previous_reading and current_reading for a month.
     
-    return previous_value, current_value
+    previous_reading is the latest reading before the month, current_reading the
+    latest reading within it; both come from correlated subqueries, so the rooms
+    and their readings load in a single query.
+    """
+    first_of_month, first_of_next_month = month_bounds(year, month)
+    readings = MeterReading.objects.filter(room_id=OuterRef('pk')).order_by('-reading_date')
+    return rooms.annotate(
+        previous_reading=Subquery(
+            readings.filter(reading_date__lt=first_of_month).values('reading_value')[:1]
+        ),
+        current_reading=Subquery(
+            readings.filter(
+                reading_date__gte=first_of_month,
+                reading_date__lt=first_of_next_month
+            ).values('reading_value')[:1]
+        ),
+    )
 
 
-def calc_month_bill(room_id: int, year: int, month: int) -> Dict[str, Any]:
+def get_month_readings(room_id: int, year: int, month: int) -> tuple[Optional[Decimal], Optional[Decimal]]:
     """
-    Calculate electricity bill for a room for a specific month.
+    Get previous and current readings for a specific month.
     
     Args:
         room_id: Room ID
@@ -111,35 +147,40 @@ def calc_month_bill(room_id: int, year: int, month: int) -> Dict[str, Any]:
         month: Month (1-12)
         
     Returns:
-        Dict with billing details
+        Tuple of (previous_reading, current_reading)
     """
-    try:
-        room = Room.objects.get(id=room_id)
-    except Room.DoesNotExist:
-        raise ValueError(f"Room with id {room_id} does not exist")
-    
-    previous_reading, current_reading = get_month_readings(room_id, year, month)
-    rate = get_rate()
+    readings = with_month_readings(
+        Room.objects.filter(id=room_id).order_by(), year, month
+    ).values_list('previous_reading', 'current_reading').first()
     
+    if readings is None:
+        return None, None
+    return tuple(quantize_reading(value) for value in readings)
+
+
+def build_month_bill(room_id, room: Room, month_label: str,
+                     previous_reading: Optional[Decimal], current_reading: Optional[Decimal],
+                     rate: Decimal) -> Dict[str, Any]:
+    """Assemble the bill dict returned by calc_month_bill for already-loaded readings."""
     try:
         bill_details = compute_bill(previous_reading, current_reading, rate)
     except ValueError as e:
         return {
             'room_id': room_id,
             'room': str(room),
-            'month': f"{year}-{month:02d}",
+            'month': month_label,
             'previous_reading': previous_reading,
             'current_reading': current_reading,
-            'units': Decimal('0'),
+            'units': ZERO,
             'rate': rate,
-            'total': Decimal('0'),
+            'total': ZERO,
             'error': str(e)
         }
     
     return {
         'room_id': room_id,
         'room': str(room),
-        'month': f"{year}-{month:02d}",
+        'month': month_label,
         'previous_reading': previous_reading,
         'current_reading': current_reading,
         'units': bill_details['units'],
@@ -148,7 +189,141 @@ def calc_month_bill(room_id: int, year: int, month: int) -> Dict[str, Any]:
     }
 
 
-def validate_monotonic_readings(room_id: int, reading_date: date, reading_value: Decimal) -> bool:
+def bill_from_invoice(invoice) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild the calc_month_bill figures stored on an electricity invoice.
+    
+    Electricity invoices keep the readings, units and rate they were billed
+    with in meta; returns None when any of them is missing.
+    """
+    meta = invoice.meta or {}
+    if not all(key in meta for key in ('previous_reading', 'current_reading', 'units', 'rate')):
+        return None
+    
+    def stored(value):
+        return Decimal(str(value)).quantize(CENTS) if value is not None else None
+    
+    return {
+        'room_id': invoice.room_id,
+        'month': invoice.month.strftime('%Y-%m'),
+        'previous_reading': stored(meta['previous_reading']),
+        'current_reading': stored(meta['current_reading']),
+        'units': stored(meta['units']),
+        'rate': stored(meta['rate']),
+        'total': invoice.total,
+    }
+
+
+def calc_month_bills_bulk(room_ids, year: int, month: int) -> Dict[int, Dict[str, Any]]:
+    """
+    Calculate electricity bills for many rooms for a specific month.
+    
+    Rooms (with what Room.__str__ reads) and their boundary readings load in
+    one query, and the rate is read once for the whole batch.
+    
+    Args:
+        room_ids: Iterable of room IDs
+        year: Year
+        month: Month (1-12)
+        
+    Returns:
+        Dict mapping room_id to billing details (see calc_month_bill);
+        rooms that do not exist are left out
+    """
+    rooms = with_month_readings(
+        Room.objects.filter(id__in=room_ids).select_related('building', 'floor').order_by(),
+        year, month
+    )
+    # Constant across the batch: resolve once, not per room
+    rate = get_rate()
+    month_label = f"{year}-{month:02d}"
+    return {
+        room.id: build_month_bill(
+            room.id, room, month_label,
+            quantize_reading(room.previous_reading),
+            quantize_reading(room.current_reading),
+            rate
+        )
+        # Stream rows: the queryset result cache would only duplicate the dict
+        for room in rooms.iterator(chunk_size=2000)
+    }
+
+
+def calc_month_bill(room_id: int, year: int, month: int) -> Dict[str, Any]:
+    """
+    Calculate electricity bill for a room for a specific month.
+    
+    Args:
+        room_id: Room ID
+        year: Year
+        month: Month (1-12)
+        
+    Returns:
+        Dict with billing details
+    """
+    bills = calc_month_bills_bulk([room_id], year, month)
+    if not bills:
+        raise ValueError(f"Room with id {room_id} does not exist")
+    
+    bill, = bills.values()
+    # Echo the id as the caller passed it (form data gives a str)
+    bill['room_id'] = room_id
+    return bill
+
+
+BILL_CACHE_TIMEOUT = 60 * 60
+
+
+def cached_month_bill(room_id: int, year: int, month: int) -> Dict[str, Any]:
+    """
+    Cached wrapper around calc_month_bill.
+    
+    The cache key includes the room's reading count, its latest reading change
+    and the current rate, so adding, editing or deleting a reading, or changing
+    the rate, moves the lookup to a new key instead of serving a stale bill.
+    
+    Args:
+        room_id: Room ID
+        year: Year
+        month: Month (1-12)
+        
+    Returns:
+        Dict with billing details (see calc_month_bill)
+    """
+    readings_state = MeterReading.objects.filter(room_id=room_id).aggregate(
+        count=Count('id'),
+        last_change=Max('updated_at')
+    )
+    last_change = readings_state['last_change']
+    key = 'ebill:{}:{}:{}:{}:{}:{}'.format(
+        room_id, year, month,
+        readings_state['count'],
+        last_change.timestamp() if last_change else 0,
+        get_rate()
+    )
+    return cache.get_or_set(key, lambda: calc_month_bill(room_id, year, month), BILL_CACHE_TIMEOUT)
+
+
+def load_room_readings(room_ids) -> Dict[int, Dict[date, Decimal]]:
+    """
+    Load every existing reading for the given rooms in one query.
+    
+    Args:
+        room_ids: Iterable of room IDs
+        
+    Returns:
+        Dict mapping room_id to {reading_date: reading_value}
+    """
+    readings_by_room = {room_id: {} for room_id in room_ids}
+    for room_id, reading_date, reading_value in MeterReading.objects.filter(
+        room_id__in=readings_by_room
+    ).values_list('room_id', 'reading_date', 'reading_value'):
+        readings_by_room[room_id][reading_date] = reading_value
+    return readings_by_room
+
+
+def validate_monotonic_readings(room_id: int, reading_date: date, reading_value: Decimal,
+                                readings_by_room: Optional[Dict[int, Dict[date, Decimal]]] = None) -> bool:
     """
     Validate that a new reading is monotonic (not less than previous reading).
     
@@ -156,22 +331,52 @@ def validate_monotonic_readings(room_id: int, reading_date: date, reading_value:
         room_id: Room ID
         reading_date: Date of the reading
         reading_value: Value of the reading
+        readings_by_room: Optional map from load_room_readings(); when given,
+            the previous reading is looked up there instead of in the database
         
     Returns:
         True if valid, False otherwise
     """
-    # Get the most recent reading before this date
-    previous_reading = MeterReading.objects.filter(
-        room_id=room_id,
-        reading_date__lt=reading_date
-    ).order_by('-reading_date').first()
+    if readings_by_room is not None:
+        room_readings = readings_by_room.get(room_id, {})
+        earlier_dates = [d for d in room_readings if d < reading_date]
+        previous_value = room_readings[max(earlier_dates)] if earlier_dates else None
+    else:
+        # Get the most recent reading value before this date
+        previous_value = MeterReading.objects.filter(
+            room_id=room_id,
+            reading_date__lt=reading_date
+        ).order_by('-reading_date').values_list('reading_value', flat=True).first()
     
-    if previous_reading and reading_value < previous_reading.reading_value:
+    if previous_value is not None and reading_value < previous_value:
         return False
     
     return True
 
 
+def billing_summary_rooms(room_id):
+    """Room queryset for the billing summary: Room.__str__ joins plus the active lease."""
+    return Room.objects.filter(id=room_id).select_related('building', 'floor').prefetch_related(
+        Prefetch(
+            'leases',
+            queryset=Lease.objects.filter(status='active'),
+            to_attr='active_leases'
+        )
+    )
+
+
+def build_rent_summary(room_id, room: Room, year: int, month: int) -> Dict[str, Any]:
+    """Assemble the rent part of a billing summary for an already-loaded room."""
+    active_lease = room.active_leases[0] if room.active_leases else None
+    return {
+        'room_id': room_id,
+        'room': str(room),
+        'month': f"{year}-{month:02d}",
+        'active_lease': active_lease,
+        'rent_due': active_lease.monthly_rent if active_lease else ZERO,
+    }
+
+
 def get_room_billing_summary(room_id: int, year: int, month: int) -> Dict[str, Any]:
     """
     Get comprehensive billing summary for a room for a specific month.
@@ -184,28 +389,21 @@ def get_room_billing_summary(room_id: int, year: int, month: int) -> Dict[str, A
     Returns:
         Dict with billing summary including lease info
     """
-    try:
-        room = Room.objects.get(id=room_id)
-    except Room.DoesNotExist:
+    # One query for the room and its month readings, one for the active lease
+    room = with_month_readings(billing_summary_rooms(room_id), year, month).first()
+    if room is None:
         raise ValueError(f"Room with id {room_id} does not exist")
     
-    # Get active lease
-    active_lease = room.leases.filter(status='active').first()
+    summary = build_rent_summary(room_id, room, year, month)
     
     # Get electricity bill
-    electricity_bill = calc_month_bill(room_id, year, month)
+    electricity_bill = build_month_bill(
+        room_id, room, summary['month'],
+        quantize_reading(room.previous_reading),
+        quantize_reading(room.current_reading),
+        get_rate()
+    )
     
-    # Get rent due
-    rent_due = Decimal('0')
-    if active_lease:
-        rent_due = active_lease.monthly_rent
-    
-    return {
-        'room_id': room_id,
-        'room': str(room),
-        'month': f"{year}-{month:02d}",
-        'active_lease': active_lease,
-        'rent_due': rent_due,
-        'electricity': electricity_bill,
-        'total_due': rent_due + electricity_bill.get('total', Decimal('0'))
-    }
+    summary['electricity'] = electricity_bill
+    summary['total_due'] = summary['rent_due'] + electricity_bill.get('total', ZERO)
+    return summary
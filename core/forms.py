@@ -1,11 +1,26 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from django.db.models import Value
+from django.db.models.functions import Lower
 from .models import (
     Building, Floor, Room, Tenant, Lease, RentPayment, 
     MeterReading, Invoice, InvoiceItem, Setting
 )
 
 
+# Tailwind classes shared by the form widgets
+INPUT_CLASS = 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
+SELECT_CLASS = 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
+TEXTAREA_CLASS = 'form-textarea rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
+TOUCH_INPUT_CLASS = 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]'
+
+# Widgets repeated across forms. Fields deep-copy the widget they are given,
+# so one instance can back any number of fields.
+SELECT_WIDGET = forms.Select(attrs={'class': SELECT_CLASS})
+DATE_WIDGET = forms.DateInput(attrs={'class': INPUT_CLASS, 'type': 'date'})
+MONEY_WIDGET = forms.NumberInput(attrs={'class': INPUT_CLASS, 'step': '0.01', 'min': '0'})
+
+
 class BuildingForm(forms.ModelForm):
     """Form for creating/editing buildings."""
     class Meta:
@@ -13,7 +28,7 @@ class BuildingForm(forms.ModelForm):
         fields = ['name']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]',
+                'class': TOUCH_INPUT_CLASS,
                 'placeholder': 'e.g., Sunshine Apartments'
             })
         }
@@ -24,7 +39,7 @@ class BuildingWithFloorsForm(forms.Form):
     building_name = forms.CharField(
         max_length=100,
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]',
+            'class': TOUCH_INPUT_CLASS,
             'placeholder': 'e.g., Sunshine Apartments'
         })
     )
@@ -33,7 +48,7 @@ class BuildingWithFloorsForm(forms.Form):
         max_value=50,
         initial=3,
         widget=forms.NumberInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]',
+            'class': TOUCH_INPUT_CLASS,
             'min': '1',
             'max': '50'
         })
@@ -43,7 +58,7 @@ class BuildingWithFloorsForm(forms.Form):
         max_value=100,
         initial=10,
         widget=forms.NumberInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]',
+            'class': TOUCH_INPUT_CLASS,
             'min': '1',
             'max': '100'
         })
@@ -53,14 +68,20 @@ class BuildingWithFloorsForm(forms.Form):
         required=False,
         initial='',
         widget=forms.TextInput(attrs={
-            'class': 'w-full px-4 py-3 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-blue-500 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 min-h-[44px]',
+            'class': TOUCH_INPUT_CLASS,
             'placeholder': 'e.g., A, B, or leave blank'
         })
     )
     
     def clean_building_name(self):
         name = self.cleaned_data.get('building_name')
-        if Building.objects.filter(name__iexact=name).exists():
+        # Compare LOWER(name) so the lookup can use building_name_lower_idx;
+        # name__iexact compiles to UPPER()/LIKE, which that index can't serve.
+        # Both sides go through the database's LOWER(): Python's str.lower()
+        # folds some characters differently (SQLite's only folds ASCII)
+        if Building.objects.annotate(name_lower=Lower('name')).filter(
+            name_lower=Lower(Value(name))
+        ).exists():
             raise ValidationError(f'A building with the name "{name}" already exists.')
         return name
 
@@ -70,69 +91,80 @@ class FloorForm(forms.ModelForm):
         model = Floor
         fields = ['building', 'floor_number']
         widgets = {
-            'building': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            }),
+            'building': SELECT_WIDGET,
             'floor_number': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'min': '0'
             })
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['building'].queryset = Building.objects.only('id', 'name')
+
 
 class RoomForm(forms.ModelForm):
     class Meta:
         model = Room
-        fields = ['building', 'floor', 'room_number', 'status', 'notes']
+        # The building is taken from the floor, so there is no building
+        # picker that has to reload the floor options on change
+        fields = ['floor', 'room_number', 'status', 'notes']
         widgets = {
-            'building': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'hx-get': '/api/floors/',
-                'hx-target': '#id_floor',
-                'hx-trigger': 'change'
-            }),
-            'floor': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'id': 'id_floor'
-            }),
+            'floor': SELECT_WIDGET,
             'room_number': forms.TextInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'Room number'
             }),
-            'status': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            }),
+            'status': SELECT_WIDGET,
             'notes': forms.Textarea(attrs={
-                'class': 'form-textarea rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': TEXTAREA_CLASS,
                 'rows': 3,
                 'placeholder': 'Additional notes'
             })
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Floor.__str__ names the building, so every option is unambiguous
+        self.fields['floor'].queryset = Floor.objects.select_related('building')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        floor = cleaned_data.get('floor')
+        if floor:
+            self.instance.building = floor.building
+        return cleaned_data
+
+    def validate_unique(self):
+        # ModelForm skips unique checks on fields the form doesn't have;
+        # keep (building, room_number) checked against the derived building
+        exclude = self._get_validation_exclusions()
+        exclude.discard('building')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
 
 class TenantForm(forms.ModelForm):
     # Add room and lease fields
     room = forms.ModelChoiceField(
-        queryset=Room.objects.filter(status='vacant'),
+        # Joined so the options' Room.__str__ doesn't query per room
+        queryset=Room.objects.filter(status='vacant').select_related('building', 'floor'),
         required=False,
         empty_label="Select a room (optional)",
-        widget=forms.Select(attrs={
-            'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-        })
+        widget=SELECT_WIDGET
     )
     start_date = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-            'type': 'date'
-        })
+        widget=DATE_WIDGET
     )
     monthly_rent = forms.DecimalField(
         required=False,
         max_digits=10,
         decimal_places=2,
         widget=forms.NumberInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'step': '0.01',
             'min': '0',
             'placeholder': 'Monthly rent'
@@ -144,7 +176,7 @@ class TenantForm(forms.ModelForm):
         decimal_places=2,
         initial=0,
         widget=forms.NumberInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'step': '0.01',
             'min': '0',
             'placeholder': 'Security deposit'
@@ -156,19 +188,19 @@ class TenantForm(forms.ModelForm):
         fields = ['full_name', 'phone', 'email', 'id_proof_url']
         widgets = {
             'full_name': forms.TextInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'Full name'
             }),
             'phone': forms.TextInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'Phone number'
             }),
             'email': forms.EmailInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'Email address'
             }),
             'id_proof_url': forms.URLInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'ID proof URL (optional)'
             })
         }
@@ -194,40 +226,25 @@ class LeaseForm(forms.ModelForm):
         model = Lease
         fields = ['tenant', 'room', 'start_date', 'end_date', 'monthly_rent', 'deposit', 'billing_day', 'status']
         widgets = {
-            'tenant': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            }),
-            'room': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            }),
-            'start_date': forms.DateInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'type': 'date'
-            }),
-            'end_date': forms.DateInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'type': 'date'
-            }),
-            'monthly_rent': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'step': '0.01',
-                'min': '0'
-            }),
-            'deposit': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'step': '0.01',
-                'min': '0'
-            }),
+            'tenant': SELECT_WIDGET,
+            'room': SELECT_WIDGET,
+            'start_date': DATE_WIDGET,
+            'end_date': DATE_WIDGET,
+            'monthly_rent': MONEY_WIDGET,
+            'deposit': MONEY_WIDGET,
             'billing_day': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'min': '1',
                 'max': '28'
             }),
-            'status': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            })
+            'status': SELECT_WIDGET
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['tenant'].queryset = Tenant.objects.only('id', 'full_name')
+        self.fields['room'].queryset = Room.objects.select_related('building', 'floor')
+
     def clean(self):
         cleaned_data = super().clean()
         start_date = cleaned_data.get('start_date')
@@ -244,44 +261,35 @@ class RentPaymentForm(forms.ModelForm):
         model = RentPayment
         fields = ['lease', 'paid_on', 'amount', 'method', 'notes']
         widgets = {
-            'lease': forms.Select(attrs={
-                'class': 'form-select rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500'
-            }),
-            'paid_on': forms.DateInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'type': 'date'
-            }),
-            'amount': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'step': '0.01',
-                'min': '0'
-            }),
+            'lease': SELECT_WIDGET,
+            'paid_on': DATE_WIDGET,
+            'amount': MONEY_WIDGET,
             'method': forms.TextInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': INPUT_CLASS,
                 'placeholder': 'Payment method (Cash, Bank Transfer, etc.)'
             }),
             'notes': forms.Textarea(attrs={
-                'class': 'form-textarea rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+                'class': TEXTAREA_CLASS,
                 'rows': 3,
                 'placeholder': 'Additional notes'
             })
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Lease.__str__ reads the tenant and the room's building and floor
+        self.fields['lease'].queryset = Lease.objects.select_related(
+            'tenant', 'room__building', 'room__floor'
+        )
+
 
 class MeterReadingForm(forms.ModelForm):
     class Meta:
         model = MeterReading
         fields = ['reading_date', 'reading_value']
         widgets = {
-            'reading_date': forms.DateInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'type': 'date'
-            }),
-            'reading_value': forms.NumberInput(attrs={
-                'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-                'step': '0.01',
-                'min': '0'
-            })
+            'reading_date': DATE_WIDGET,
+            'reading_value': MONEY_WIDGET
         }
 
 
@@ -291,18 +299,14 @@ class SettingForm(forms.Form):
         max_digits=10,
         decimal_places=2,
         required=False,
-        widget=forms.NumberInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
-            'step': '0.01',
-            'min': '0'
-        })
+        widget=MONEY_WIDGET
     )
     currency_symbol = forms.CharField(
         label='Currency Symbol',
         max_length=5,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'placeholder': '₹'
         })
     )
@@ -311,7 +315,7 @@ class SettingForm(forms.Form):
         max_length=50,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'placeholder': 'Asia/Kolkata'
         })
     )
@@ -320,7 +324,7 @@ class SettingForm(forms.Form):
         max_length=100,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'placeholder': 'Organization name'
         })
     )
@@ -328,7 +332,7 @@ class SettingForm(forms.Form):
         label='Address',
         required=False,
         widget=forms.Textarea(attrs={
-            'class': 'form-textarea rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': TEXTAREA_CLASS,
             'rows': 3,
             'placeholder': 'Organization address'
         })
@@ -338,7 +342,7 @@ class SettingForm(forms.Form):
         max_length=15,
         required=False,
         widget=forms.TextInput(attrs={
-            'class': 'form-input rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500',
+            'class': INPUT_CLASS,
             'placeholder': 'GSTIN number'
         })
     )
@@ -1,13 +1,27 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from contextlib import contextmanager
 from decimal import Decimal
 from datetime import date, timedelta
 import random
 
+from simple_history.utils import bulk_create_with_history
+
 from core.models import (
     Building, Floor, Room, Tenant, Lease, RentPayment, 
     MeterReading, Invoice, InvoiceItem, Setting
 )
+from core.signals import clear_setting_cache, table_version_cache_key
+
+
+# make_password('admin123'), computed once so seeding skips the deliberately
+# slow PBKDF2 work; logging in still verifies (and upgrades) it as usual
+DEMO_ADMIN_PASSWORD_HASH = (
+    'pbkdf2_sha256$720000$AuWlocte8Huo5G2RwtmmWh$7fqOK5p9d24Q9fazZf601B4jzy8lLoA71hf7LHsCUM0='
+)
 
 
 class Command(BaseCommand):
@@ -19,62 +33,124 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per INSERT when bulk creating (default: 500)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed for the random demo values, for reproducible data',
+        )
+        parser.add_argument(
+            '--defer-indexes',
+            action='store_true',
+            help='Drop non-unique indexes on the seeded tables while loading and rebuild them after',
+        )
 
+    @transaction.atomic
     def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.rng = random.Random(options['seed'])
+        
         if options['clear']:
             self.stdout.write('Clearing existing data...')
             self.clear_data()
 
         self.stdout.write('Creating demo data...')
         
-        # Create superuser if it doesn't exist
-        self.create_superuser()
-        
-        # Create buildings and floors
-        buildings = self.create_buildings()
-        
-        # Create rooms
-        rooms = self.create_rooms(buildings)
-        
-        # Create tenants
-        tenants = self.create_tenants()
-        
-        # Create leases
-        leases = self.create_leases(tenants, rooms)
-        
-        # Create meter readings
-        self.create_meter_readings(rooms)
-        
-        # Create rent payments
-        self.create_rent_payments(leases)
-        
-        # Create settings
-        self.create_settings()
+        with self.deferred_indexes(options['defer_indexes']):
+            # Create superuser if it doesn't exist
+            self.create_superuser()
+            
+            # Create buildings and floors
+            buildings, floors = self.create_buildings()
+            
+            # Create rooms
+            rooms = self.create_rooms(buildings, floors)
+            
+            # Create tenants
+            tenants = self.create_tenants()
+            
+            # Create leases
+            leases = self.create_leases(tenants, rooms)
+            
+            # Create meter readings
+            self.create_meter_readings(rooms)
+            
+            # Create rent payments
+            self.create_rent_payments(leases)
+            
+            # Create settings
+            self.create_settings()
         
         self.stdout.write(
             self.style.SUCCESS('Successfully created demo data!')
         )
 
+    @contextmanager
+    def deferred_indexes(self, enabled):
+        """
+        Drop the plain Meta.indexes of the bulk-loaded tables, then rebuild them.
+        
+        Unique constraints stay in place, so integrity is still checked row by
+        row; only lookup indexes stop being maintained during the load. The
+        statements run inside handle()'s transaction, so a failed seed
+        restores them too.
+        """
+        indexes = [
+            (model, index)
+            for model in (Tenant, Lease, RentPayment, MeterReading)
+            for index in model._meta.indexes
+        ] if enabled else []
+        # Only used to render and run the index SQL, so it is never entered;
+        # SQLite refuses to enter a schema editor inside a transaction
+        schema_editor = connection.schema_editor()
+        
+        for model, index in indexes:
+            schema_editor.execute(index.remove_sql(model, schema_editor))
+        yield
+        for model, index in indexes:
+            schema_editor.execute(index.create_sql(model, schema_editor))
+        
+        if indexes:
+            self.stdout.write(f'Rebuilt {len(indexes)} index(es)')
+
+    @transaction.atomic
     def clear_data(self):
-        """Clear existing data."""
-        InvoiceItem.objects.all().delete()
-        Invoice.objects.all().delete()
-        RentPayment.objects.all().delete()
-        MeterReading.objects.all().delete()
-        Lease.objects.all().delete()
-        Tenant.objects.all().delete()
-        Room.objects.all().delete()
-        Floor.objects.all().delete()
-        Building.objects.all().delete()
-        Setting.objects.all().delete()
+        """
+        Clear existing data.
+        
+        Issues the backend's flush SQL (TRUNCATE ... CASCADE on PostgreSQL,
+        DELETE FROM on SQLite) instead of ORM deletes, so no rows are loaded
+        and no delete signals or history records are produced.
+        """
+        models = [
+            InvoiceItem, Invoice, RentPayment, MeterReading, Lease,
+            Tenant, Room, Floor, Building, Setting,
+        ]
+        tables = [model._meta.db_table for model in models]
+        sql_list = connection.ops.sql_flush(
+            no_style(), tables, reset_sequences=True, allow_cascade=True
+        )
+        connection.ops.execute_sql_flush(sql_list)
+        
+        # Signals were bypassed, so drop what they would have invalidated
+        clear_setting_cache()
+        cache.delete_many([table_version_cache_key(model) for model in (Building, Floor)])
 
     def create_superuser(self):
         """Create superuser if it doesn't exist."""
         if not User.objects.filter(username='admin').exists():
-            User.objects.create_superuser(
+            User.objects.create(
                 username='admin',
                 email='admin@example.com',
-                password='admin123'
+                password=DEMO_ADMIN_PASSWORD_HASH,
+                is_staff=True,
+                is_superuser=True
             )
             self.stdout.write('Created superuser: admin/admin123')
 
@@ -87,36 +163,37 @@ class Command(BaseCommand):
         buildings.append(building)
         
         # Create floors
-        floors = []
-        for floor_num in range(1, 4):  # 3 floors
-            floor = Floor.objects.create(
-                building=building,
-                floor_number=floor_num
-            )
-            floors.append(floor)
+        floors = Floor.objects.bulk_create([
+            Floor(building=building, floor_number=floor_num)
+            for floor_num in range(1, 4)  # 3 floors
+        ])
         
         self.stdout.write(f'Created {len(buildings)} building(s) with {len(floors)} floor(s)')
-        return buildings
+        return buildings, floors
 
-    def create_rooms(self, buildings):
+    def create_rooms(self, buildings, floors):
         """Create rooms."""
         rooms = []
         building = buildings[0]
-        floors = Floor.objects.filter(building=building)
+        # Draw every room's status in one call
+        statuses = iter(self.rng.choices(
+            ['vacant', 'occupied', 'maintenance'], k=len(floors) * 4
+        ))
         
         room_counter = 1
         for floor in floors:
             for room_num in range(1, 5):  # 4 rooms per floor
-                room = Room.objects.create(
+                rooms.append(Room(
                     building=building,
                     floor=floor,
                     room_number=f"{room_counter:03d}",
-                    status=random.choice(['vacant', 'occupied', 'maintenance']),
+                    status=next(statuses),
                     notes=f"Room {room_counter} on floor {floor.floor_number}"
-                )
-                rooms.append(room)
+                ))
                 room_counter += 1
         
+        rooms = bulk_create_with_history(rooms, Room, batch_size=self.batch_size)
+        
         self.stdout.write(f'Created {len(rooms)} room(s)')
         return rooms
 
@@ -128,15 +205,16 @@ class Command(BaseCommand):
             "Chris Garcia", "Maria Rodriguez", "James Martinez", "Jennifer Lee"
         ]
         
-        tenants = []
-        for i, name in enumerate(tenant_names):
-            tenant = Tenant.objects.create(
+        tenants = [
+            Tenant(
                 full_name=name,
                 phone=f"555-{1000 + i:04d}",
                 email=f"{name.lower().replace(' ', '.')}@example.com",
                 id_proof_url=f"https://example.com/id-proof/{i+1}.pdf"
             )
-            tenants.append(tenant)
+            for i, name in enumerate(tenant_names)
+        ]
+        tenants = bulk_create_with_history(tenants, Tenant, batch_size=self.batch_size)
         
         self.stdout.write(f'Created {len(tenants)} tenant(s)')
         return tenants
@@ -149,65 +227,70 @@ class Command(BaseCommand):
         for i, room in enumerate(occupied_rooms[:len(tenants)]):
             tenant = tenants[i]
             
-            # Create lease
-            lease = Lease.objects.create(
+            leases.append(Lease(
                 tenant=tenant,
                 room=room,
-                start_date=date.today() - timedelta(days=random.randint(30, 365)),
+                start_date=date.today() - timedelta(days=self.rng.randint(30, 365)),
                 end_date=None,  # No end date for active leases
-                monthly_rent=Decimal(str(random.randint(3000, 8000))),
-                deposit=Decimal(str(random.randint(5000, 15000))),
-                billing_day=random.randint(1, 28),
+                monthly_rent=Decimal(self.rng.randint(3000, 8000)),
+                deposit=Decimal(self.rng.randint(5000, 15000)),
+                billing_day=self.rng.randint(1, 28),
                 status='active'
-            )
-            leases.append(lease)
+            ))
+        
+        # One INSERT for the leases and one UPDATE marking their rooms occupied
+        leases = Lease.bulk_create_active(leases, batch_size=self.batch_size)
         
         self.stdout.write(f'Created {len(leases)} lease(s)')
         return leases
 
     def create_meter_readings(self, rooms):
         """Create meter readings."""
-        readings_created = 0
+        readings = []
         
         # Create readings for last 3 months
-        for month_offset in range(3):
-            reading_date = date.today().replace(day=15) - timedelta(days=30 * month_offset)
-            
-            for room in rooms:
+        mid_month = date.today().replace(day=15)
+        reading_dates = [mid_month - timedelta(days=30 * month_offset) for month_offset in range(3)]
+        room_ids = [room.pk for room in rooms]
+        
+        for month_offset, reading_date in enumerate(reading_dates):
+            for room_id in room_ids:
                 # Base reading value
-                base_value = random.randint(1000, 5000)
-                reading_value = base_value + (month_offset * random.randint(50, 200))
+                base_value = self.rng.randint(1000, 5000)
+                reading_value = base_value + (month_offset * self.rng.randint(50, 200))
                 
-                MeterReading.objects.create(
-                    room=room,
+                readings.append(MeterReading(
+                    room_id=room_id,
                     reading_date=reading_date,
-                    reading_value=Decimal(str(reading_value))
-                )
-                readings_created += 1
+                    reading_value=Decimal(reading_value)
+                ))
         
-        self.stdout.write(f'Created {readings_created} meter reading(s)')
+        bulk_create_with_history(readings, MeterReading, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(readings)} meter reading(s)')
 
     def create_rent_payments(self, leases):
         """Create rent payments."""
-        payments_created = 0
+        payments = []
+        # Create 2-4 payments per lease, drawing all the methods in one call
+        payment_counts = [self.rng.randint(2, 4) for lease in leases]
+        methods = iter(self.rng.choices(
+            ['Cash', 'Bank Transfer', 'Cheque', 'UPI'], k=sum(payment_counts)
+        ))
         
-        for lease in leases:
-            # Create 2-4 payments per lease
-            num_payments = random.randint(2, 4)
-            
+        for lease, num_payments in zip(leases, payment_counts):
             for i in range(num_payments):
-                payment_date = date.today() - timedelta(days=random.randint(1, 90))
+                payment_date = date.today() - timedelta(days=self.rng.randint(1, 90))
                 
-                RentPayment.objects.create(
-                    lease=lease,
+                payments.append(RentPayment(
+                    lease_id=lease.pk,
                     paid_on=payment_date,
                     amount=lease.monthly_rent,
-                    method=random.choice(['Cash', 'Bank Transfer', 'Cheque', 'UPI']),
+                    method=next(methods),
                     notes=f"Payment for {payment_date.strftime('%B %Y')}"
-                )
-                payments_created += 1
+                ))
         
-        self.stdout.write(f'Created {payments_created} rent payment(s)')
+        RentPayment.objects.bulk_create(payments, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(payments)} rent payment(s)')
 
     def create_settings(self):
         """Create settings."""
@@ -220,7 +303,12 @@ class Command(BaseCommand):
             ('gstin', '12ABCDE1234F1Z5'),
         ]
         
-        for key, value in settings_data:
-            Setting.objects.get_or_create(key=key, defaults={'value': value})
+        # Existing keys keep their values, like get_or_create would
+        Setting.objects.bulk_create(
+            [Setting(key=key, value=value) for key, value in settings_data],
+            ignore_conflicts=True
+        )
+        # bulk_create skips the post_save signal that normally does this
+        clear_setting_cache()
         
         self.stdout.write(f'Created {len(settings_data)} setting(s)')
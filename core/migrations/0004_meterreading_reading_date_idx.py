@@ -0,0 +1,19 @@
+# Generated migration - Index reading_date for month-range filters across all rooms
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_add_indexes_and_constraints'),
+    ]
+
+    operations = [
+        # meter_room_date_idx only helps when room_id is filtered too; month
+        # filters on their own scan reading_date as a half-open range.
+        migrations.AddIndex(
+            model_name='meterreading',
+            index=models.Index(fields=['reading_date'], name='meter_date_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated migration - Drop index duplicated by the (room, reading_date) unique constraint
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_meterreading_reading_date_idx'),
+    ]
+
+    operations = [
+        # unique_together = ['room', 'reading_date'] already creates a unique
+        # index on the same columns; it serves room lookups ordered by
+        # reading_date in either direction, so this copy only slowed inserts.
+        migrations.RemoveIndex(
+            model_name='meterreading',
+            name='meter_room_date_idx',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated migration - Case-insensitive index for building name lookups
+
+from django.db import migrations, models
+import django.db.models.functions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_remove_meterreading_meter_room_date_idx'),
+    ]
+
+    operations = [
+        # Serves the LOWER(name) = ... duplicate check in BuildingWithFloorsForm
+        migrations.AddIndex(
+            model_name='building',
+            index=models.Index(
+                django.db.models.functions.Lower('name'),
+                name='building_name_lower_idx'
+            ),
+        ),
+    ]
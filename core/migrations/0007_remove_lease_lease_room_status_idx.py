@@ -0,0 +1,22 @@
+# Generated migration - Drop lease index covered by the active-lease constraint
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_building_name_lower_idx'),
+    ]
+
+    operations = [
+        # The hot probe is room + status='active' (Lease.clean and the active
+        # lease lookups), which unique_active_lease_per_room already serves:
+        # it is a partial unique index on room_id WHERE status = 'active'.
+        # Other room lookups use the room_id foreign key index, so this
+        # composite copy only added a write to every lease insert and update.
+        migrations.RemoveIndex(
+            model_name='lease',
+            name='lease_room_status_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated migration - Index invoice month and payment date for all-room reports
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_remove_lease_lease_room_status_idx'),
+    ]
+
+    operations = [
+        # invoice_room_month_idx and payment_lease_date_idx lead with room /
+        # lease, so month-wide lists and reports (invoices for a month,
+        # payments since a date) scanned the whole table. Plain B-trees keep
+        # SQLite and PostgreSQL on the same schema.
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['month'], name='invoice_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentpayment',
+            index=models.Index(fields=['paid_on'], name='payment_paid_on_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from decimal import Decimal
+from django.utils import timezone
+from decimal import Decimal, InvalidOperation
 from simple_history.models import HistoricalRecords
-import json
+from simple_history.utils import bulk_create_with_history
 
 
 class Building(models.Model):
@@ -14,6 +17,9 @@ class Building(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(Lower('name'), name='building_name_lower_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -55,6 +61,12 @@ class Room(models.Model):
     class Meta:
         unique_together = ['building', 'room_number']
         ordering = ['building', 'floor__floor_number', 'room_number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['building', 'room_number'],
+                name='unique_room_per_building'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.building.name} - Floor {self.floor.floor_number} - Room {self.room_number}"
@@ -77,6 +89,9 @@ class Tenant(models.Model):
 
     class Meta:
         ordering = ['full_name']
+        indexes = [
+            models.Index(fields=['phone'], name='tenant_phone_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -107,6 +122,24 @@ class Lease(models.Model):
 
     class Meta:
         ordering = ['-start_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['room'],
+                condition=models.Q(status='active'),
+                name='unique_active_lease_per_room'
+            ),
+            models.CheckConstraint(
+                check=models.Q(end_date__isnull=True) | models.Q(end_date__gt=models.F('start_date')),
+                name='end_date_after_start_date'
+            ),
+            models.CheckConstraint(
+                check=models.Q(monthly_rent__gt=0),
+                name='monthly_rent_positive'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'start_date'], name='lease_status_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.tenant.full_name} - {self.room}"
@@ -114,40 +147,67 @@ class Lease(models.Model):
     def clean(self):
         if self.end_date and self.end_date <= self.start_date:
             raise ValidationError("End date must be after start date.")
-        
-        # For NEW active leases, check if room already has an active lease
-        # (Don't check room.status because it will be updated to 'occupied' on save)
-        if self.status == 'active' and not self.pk:
-            # Check for existing active lease on this room
-            existing_active = Lease.objects.filter(
-                room=self.room,
-                status='active'
-            ).exclude(pk=self.pk if self.pk else None).exists()
-            
-            if existing_active:
-                raise ValidationError("This room already has an active lease.")
-        
-        # For existing leases being updated to active, verify room isn't already occupied by another lease
-        elif self.status == 'active' and self.pk:
-            existing_active = Lease.objects.filter(
-                room=self.room,
-                status='active'
-            ).exclude(pk=self.pk).exists()
-            
-            if existing_active:
-                raise ValidationError("This room already has another active lease.")
+        # One active lease per room is enforced by the unique_active_lease_per_room
+        # constraint; save() reports a violation as a ValidationError
 
     def save(self, *args, **kwargs):
         self.clean()
-        if self.status == 'active' and not self.pk:
-            # New active lease - set room to occupied
-            self.room.status = 'occupied'
-            self.room.save()
-        elif self.status == 'ended' and self.pk:
-            # Lease ended - set room to vacant
-            self.room.status = 'vacant'
-            self.room.save()
-        super().save(*args, **kwargs)
+        adding = self.pk is None
+        try:
+            # Roll back the room status change if the lease write fails
+            with transaction.atomic():
+                # Room status changes stay in the room's history, but only
+                # the changed columns are written
+                if self.status == 'active' and adding:
+                    # New active lease - set room to occupied
+                    self.room.status = 'occupied'
+                    self.room.save(update_fields=['status', 'updated_at'])
+                elif self.status == 'ended' and not adding:
+                    # Lease ended - set room to vacant
+                    self.room.status = 'vacant'
+                    self.room.save(update_fields=['status', 'updated_at'])
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            # Only reached on failure, so this lookup costs nothing on the happy path
+            if self.status == 'active' and Lease.objects.filter(
+                room_id=self.room_id, status='active'
+            ).exclude(pk=self.pk).exists():
+                if adding:
+                    raise ValidationError("This room already has an active lease.")
+                raise ValidationError("This room already has another active lease.")
+            raise
+
+    @classmethod
+    @transaction.atomic
+    def bulk_create_active(cls, leases, batch_size=None):
+        """
+        Create many new active leases and mark their rooms occupied.
+        
+        Does what save() does for each lease, with one existence check, one
+        batched INSERT and one room UPDATE instead of several queries per
+        lease. History rows are still written for leases and rooms.
+        """
+        room_ids = [lease.room_id for lease in leases]
+        if len(set(room_ids)) != len(room_ids):
+            raise ValidationError("A room can only have one active lease.")
+        for lease in leases:
+            if lease.end_date and lease.end_date <= lease.start_date:
+                raise ValidationError("End date must be after start date.")
+        if cls.objects.filter(room_id__in=room_ids, status='active').exists():
+            raise ValidationError("This room already has an active lease.")
+        
+        for lease in leases:
+            lease.status = 'active'
+        leases = bulk_create_with_history(leases, cls, batch_size=batch_size)
+        
+        rooms = [lease.room for lease in leases]
+        now = timezone.now()
+        for room in rooms:
+            room.status = 'occupied'
+            room.updated_at = now
+        Room.objects.filter(pk__in=room_ids).update(status='occupied', updated_at=now)
+        Room.history.bulk_history_create(rooms, batch_size=batch_size, update=True)
+        return leases
 
 
 class RentPayment(models.Model):
@@ -162,6 +222,10 @@ class RentPayment(models.Model):
 
     class Meta:
         ordering = ['-paid_on']
+        indexes = [
+            models.Index(fields=['lease', 'paid_on'], name='payment_lease_date_idx'),
+            models.Index(fields=['paid_on'], name='payment_paid_on_idx'),
+        ]
 
     def __str__(self):
         return f"{self.lease} - {self.amount} on {self.paid_on}"
@@ -180,6 +244,9 @@ class MeterReading(models.Model):
     class Meta:
         unique_together = ['room', 'reading_date']
         ordering = ['room', '-reading_date']
+        indexes = [
+            models.Index(fields=['reading_date'], name='meter_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.room} - {self.reading_value} on {self.reading_date}"
@@ -209,6 +276,10 @@ class Invoice(models.Model):
     class Meta:
         unique_together = ['room', 'month', 'type']
         ordering = ['-month', 'room']
+        indexes = [
+            models.Index(fields=['room', 'month'], name='invoice_room_month_idx'),
+            models.Index(fields=['month'], name='invoice_month_idx'),
+        ]
 
     def __str__(self):
         return f"{self.room} - {self.type} - {self.month.strftime('%Y-%m')}"
@@ -244,11 +315,32 @@ class Setting(models.Model):
     def __str__(self):
         return f"{self.key}: {self.value}"
 
+    # All settings as one {key: value} dict; dropped by core.signals on change.
+    # That only reaches the saving process's cache unless CACHE_URL is shared,
+    # so keep the timeout short enough to bound how stale other workers get.
+    VALUES_CACHE_KEY = 'settings:values'
+    VALUES_CACHE_TIMEOUT = 5 * 60
+
+    @classmethod
+    def get_values(cls):
+        return cache.get_or_set(
+            cls.VALUES_CACHE_KEY,
+            lambda: dict(cls.objects.values_list('key', 'value')),
+            cls.VALUES_CACHE_TIMEOUT
+        )
+
     @classmethod
     def get_value(cls, key, default=None):
+        return cls.get_values().get(key, default)
+
+    @classmethod
+    def get_decimal(cls, key, default=None):
+        value = cls.get_value(key)
+        if value is None:
+            return default
         try:
-            return cls.objects.get(key=key).value
-        except cls.DoesNotExist:
+            return Decimal(value)
+        except (InvalidOperation, ValueError, TypeError):
             return default
 
     @classmethod
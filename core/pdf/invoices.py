@@ -1,234 +1,265 @@
 from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.core.cache import cache
 from weasyprint import HTML, CSS
 from weasyprint.text.fonts import FontConfiguration
+import hashlib
+import json
 import os
-from datetime import datetime
+from datetime import date, datetime
+from pathlib import Path
 
-from ..models import Invoice, Setting
+from ..models import Invoice, Room, Setting, Tenant
 
 
-def generate_invoice_pdf(invoice_id):
-    """Generate PDF for an invoice."""
+# Rendered PDFs are keyed by content and render date, so a changed invoice
+# or a new day simply misses; a key is never reused after its day ends
+INVOICE_PDF_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Parsed once per process: building a CSS object tokenizes and preprocesses
+# the stylesheet, which is most of the fixed cost of each PDF
+FONT_CONFIG = FontConfiguration()
+
+CSS_DIR = Path(__file__).resolve().parent / 'css'
+
+# Page setup, header, organization block and footer shared by every invoice
+BASE_PDF_CSS = CSS(filename=CSS_DIR / 'base.css', font_config=FONT_CONFIG)
+
+INVOICE_CSS = CSS(filename=CSS_DIR / 'invoice.css', font_config=FONT_CONFIG)
+
+ELECTRICITY_INVOICE_CSS = CSS(
+    filename=CSS_DIR / 'electricity_invoice.css', font_config=FONT_CONFIG
+)
+
+
+def _org_context():
+    """Organization details printed on every invoice."""
+    values = Setting.get_values()
+    return {
+        'org_name': values.get('org_name', 'Rental Management System'),
+        'org_address': values.get('address', ''),
+        'gstin': values.get('gstin', ''),
+        'currency_symbol': values.get('currency_symbol', '₹'),
+    }
+
+
+def _tenant_info(tenant):
+    return {
+        'name': tenant.full_name,
+        'phone': tenant.phone,
+        'email': tenant.email,
+    }
+
+
+def _get_invoice(invoice_id):
     try:
-        invoice = Invoice.objects.get(id=invoice_id)
+        return (
+            Invoice.objects.select_related('room__building', 'room__floor')
+            .prefetch_related('items')
+            .get(id=invoice_id)
+        )
     except Invoice.DoesNotExist:
         raise ValueError(f"Invoice with id {invoice_id} does not exist")
+
+
+def generate_invoice_pdf(invoice_id, target=None):
+    """
+    Generate PDF for an invoice.
+
+    Returns the PDF bytes, cached under a hash of everything the PDF prints,
+    so repeat downloads of an unchanged invoice skip WeasyPrint entirely.
+    When `target` (a path or binary file object) is given the PDF is
+    streamed there uncached and None is returned.
+    """
+    context = _invoice_context(_get_invoice(invoice_id))
+    if target is not None:
+        return _render_invoice(context).write_pdf(target=target)
     
-    # Get organization settings
-    org_name = Setting.get_value('org_name', 'Rental Management System')
-    org_address = Setting.get_value('address', '')
-    gstin = Setting.get_value('gstin', '')
-    currency_symbol = Setting.get_value('currency_symbol', '₹')
-    
+    cache_key = f"invoice_pdf:{context['invoice'].pk}:{_invoice_fingerprint(context)}"
+    pdf_bytes = cache.get(cache_key)
+    if pdf_bytes is None:
+        pdf_bytes = _render_invoice(context).write_pdf()
+        cache.set(cache_key, pdf_bytes, INVOICE_PDF_CACHE_TIMEOUT)
+    return pdf_bytes
+
+
+def _invoice_fingerprint(context):
+    """
+    Hash of the values an invoice PDF prints.
+
+    The header's invoice date is the render date, so the day is part of the
+    hash; only the footer's time of day may differ on a cache hit.
+    """
+    invoice = context['invoice']
+    printed = [
+        context['generated_at'].date(),
+        invoice.type, invoice.month, invoice.subtotal, invoice.tax, invoice.total,
+        [(item.label, item.qty, item.rate, item.amount) for item in invoice.items.all()],
+        context['room'].room_number, context['building'].name, context['floor'].floor_number,
+        context['tenant_info'],
+        [context[key] for key in ('org_name', 'org_address', 'gstin', 'currency_symbol')],
+    ]
+    return hashlib.sha256(json.dumps(printed, default=str).encode()).hexdigest()
+
+
+def _invoice_context(invoice):
     # Get tenant info if available
     tenant_info = None
     if invoice.meta and 'tenant_id' in invoice.meta:
-        from ..models import Tenant
         try:
-            tenant = Tenant.objects.get(id=invoice.meta['tenant_id'])
-            tenant_info = {
-                'name': tenant.full_name,
-                'phone': tenant.phone,
-                'email': tenant.email,
-            }
+            tenant = Tenant.objects.only('full_name', 'phone', 'email').get(
+                id=invoice.meta['tenant_id']
+            )
+            tenant_info = _tenant_info(tenant)
         except Tenant.DoesNotExist:
             pass
     
     # Get room info
     room = invoice.room
-    building = room.building
-    floor = room.floor
     
     context = {
+        **_org_context(),
         'invoice': invoice,
-        'org_name': org_name,
-        'org_address': org_address,
-        'gstin': gstin,
-        'currency_symbol': currency_symbol,
         'tenant_info': tenant_info,
         'room': room,
-        'building': building,
-        'floor': floor,
+        'building': room.building,
+        'floor': room.floor,
         'generated_at': datetime.now(),
     }
     
-    # Render HTML template
+    return context
+
+
+def _render_invoice(context):
+    """Lay out an invoice, returning the WeasyPrint document."""
     html_string = render_to_string('core/pdf/invoice.html', context)
     
-    # Generate PDF
-    font_config = FontConfiguration()
-    html_doc = HTML(string=html_string)
+    return HTML(string=html_string).render(
+        stylesheets=[BASE_PDF_CSS, INVOICE_CSS], font_config=FONT_CONFIG
+    )
+
+
+def generate_invoices_pdf_batch(invoice_ids):
+    """
+    Generate PDFs for several invoices with a single layout pass.
+
+    All invoices are rendered into one document, one <section> each, and the
+    laid-out pages are split back per invoice using the section anchors.
+    Returns {invoice_id: pdf_bytes}; unknown ids are skipped.
+    """
+    invoices = list(
+        Invoice.objects.filter(id__in=invoice_ids)
+        .select_related('room__building', 'room__floor')
+        .prefetch_related('items')
+        .order_by('id')
+    )
+    if not invoices:
+        return {}
     
-    css_string = """
-    @page {
-        size: A4;
-        margin: 1cm;
-    }
-    body {
-        font-family: Arial, sans-serif;
-        font-size: 12px;
-        line-height: 1.4;
-    }
-    .header {
-        border-bottom: 2px solid #333;
-        padding-bottom: 10px;
-        margin-bottom: 20px;
-    }
-    .invoice-title {
-        font-size: 24px;
-        font-weight: bold;
-        color: #333;
-    }
-    .invoice-number {
-        font-size: 14px;
-        color: #666;
-    }
-    .org-info {
-        margin-bottom: 20px;
-    }
-    .org-name {
-        font-size: 16px;
-        font-weight: bold;
-        margin-bottom: 5px;
-    }
-    .org-address {
-        color: #666;
-        margin-bottom: 5px;
-    }
-    .gstin {
-        color: #666;
-        font-size: 11px;
-    }
-    .invoice-details {
-        margin-bottom: 20px;
-    }
-    .detail-row {
-        display: flex;
-        margin-bottom: 5px;
-    }
-    .detail-label {
-        font-weight: bold;
-        width: 150px;
+    tenant_ids = {
+        invoice.meta['tenant_id'] for invoice in invoices
+        if invoice.meta and 'tenant_id' in invoice.meta
     }
-    .detail-value {
-        flex: 1;
-    }
-    .items-table {
-        width: 100%;
-        border-collapse: collapse;
-        margin-bottom: 20px;
-    }
-    .items-table th,
-    .items-table td {
-        border: 1px solid #ddd;
-        padding: 8px;
-        text-align: left;
-    }
-    .items-table th {
-        background-color: #f5f5f5;
-        font-weight: bold;
-    }
-    .items-table .text-right {
-        text-align: right;
-    }
-    .totals {
-        margin-top: 20px;
-        text-align: right;
-    }
-    .total-row {
-        display: flex;
-        justify-content: space-between;
-        margin-bottom: 5px;
-    }
-    .total-label {
-        font-weight: bold;
-    }
-    .total-value {
-        font-weight: bold;
-    }
-    .grand-total {
-        font-size: 16px;
-        border-top: 2px solid #333;
-        padding-top: 10px;
-    }
-    .footer {
-        margin-top: 30px;
-        text-align: center;
-        color: #666;
-        font-size: 10px;
-    }
-    """
+    tenants = Tenant.objects.in_bulk(tenant_ids)
     
-    css_doc = CSS(string=css_string, font_config=font_config)
+    entries = []
+    for invoice in invoices:
+        tenant = tenants.get(invoice.meta.get('tenant_id')) if invoice.meta else None
+        entries.append({
+            'invoice': invoice,
+            'tenant_info': _tenant_info(tenant) if tenant else None,
+        })
     
-    # Generate PDF bytes
-    pdf_bytes = html_doc.write_pdf(stylesheets=[css_doc], font_config=font_config)
+    context = {
+        **_org_context(),
+        'invoices': entries,
+        'generated_at': datetime.now(),
+    }
+    html_string = render_to_string('core/pdf/invoice_batch.html', context)
+    document = HTML(string=html_string).render(
+        stylesheets=[BASE_PDF_CSS, INVOICE_CSS], font_config=FONT_CONFIG
+    )
     
-    return pdf_bytes
+    # Each section starts on a new page, so the page carrying an invoice's
+    # anchor opens its run of pages; anything before the first anchor
+    # belongs to no invoice and is dropped
+    anchors = {f'invoice-{invoice.id}': invoice.id for invoice in invoices}
+    pages_by_invoice = {}
+    current = None
+    for page in document.pages:
+        for anchor in page.anchors:
+            if anchor in anchors:
+                current = anchors[anchor]
+                break
+        if current is None:
+            continue
+        pages_by_invoice.setdefault(current, []).append(page)
+    
+    return {
+        invoice_id: document.copy(pages).write_pdf()
+        for invoice_id, pages in pages_by_invoice.items()
+    }
 
 
 def save_invoice_pdf(invoice_id):
     """Generate and save PDF for an invoice, returning the file path."""
-    pdf_bytes = generate_invoice_pdf(invoice_id)
-    
-    # Create media directory if it doesn't exist
-    media_dir = os.path.join(settings.MEDIA_ROOT, 'invoices')
-    os.makedirs(media_dir, exist_ok=True)
+    invoice = _get_invoice(invoice_id)
+    # Layout happens before the file is opened, so a failed render
+    # doesn't leave an empty PDF behind
+    document = _render_invoice(_invoice_context(invoice))
     
     # Generate filename
-    invoice = Invoice.objects.get(id=invoice_id)
+    media_dir = os.path.join(settings.MEDIA_ROOT, 'invoices')
     filename = f"invoice_{invoice_id}_{invoice.month.strftime('%Y%m')}.pdf"
     file_path = os.path.join(media_dir, filename)
     
-    # Save PDF file
-    with open(file_path, 'wb') as f:
-        f.write(pdf_bytes)
+    # Save PDF file; the media directory is only created the first time
+    # a write finds it missing, not checked before every write
+    try:
+        f = open(file_path, 'wb')
+    except FileNotFoundError:
+        os.makedirs(media_dir, exist_ok=True)
+        f = open(file_path, 'wb')
+    with f:
+        document.write_pdf(target=f)
     
     # Update invoice with PDF URL
     invoice.pdf_url = f"/media/invoices/{filename}"
-    invoice.save()
+    invoice.save(update_fields=['pdf_url', 'updated_at'])
     
     return file_path
 
 
 def generate_electricity_invoice_pdf(room_id, year, month):
     """Generate PDF for electricity invoice."""
-    from ..billing.electricity import calc_month_bill
+    from ..billing.electricity import bill_from_invoice, calc_month_bill
+    
+    # An invoice already issued for the month fixes the billed figures;
+    # only recalculate from the readings when there is none
+    invoice = Invoice.objects.filter(
+        room_id=room_id, month=date(year, month, 1), type='electricity'
+    ).only('room_id', 'month', 'total', 'meta').first()
+    bill_data = bill_from_invoice(invoice) if invoice else None
     
-    # Calculate bill
-    bill_data = calc_month_bill(room_id, year, month)
+    if bill_data is None:
+        bill_data = calc_month_bill(room_id, year, month)
     
     if 'error' in bill_data:
         raise ValueError(bill_data['error'])
     
     # Get room info
-    from ..models import Room
-    room = Room.objects.get(id=room_id)
-    
-    # Get organization settings
-    org_name = Setting.get_value('org_name', 'Rental Management System')
-    org_address = Setting.get_value('address', '')
-    gstin = Setting.get_value('gstin', '')
-    currency_symbol = Setting.get_value('currency_symbol', '₹')
+    room = Room.objects.select_related('building', 'floor').get(id=room_id)
     
     # Get tenant info if available
     tenant_info = None
-    active_lease = room.leases.filter(status='active').first()
+    active_lease = room.leases.filter(status='active').select_related('tenant').first()
     if active_lease:
-        tenant_info = {
-            'name': active_lease.tenant.full_name,
-            'phone': active_lease.tenant.phone,
-            'email': active_lease.tenant.email,
-        }
+        tenant_info = _tenant_info(active_lease.tenant)
     
     context = {
+        **_org_context(),
         'bill_data': bill_data,
-        'org_name': org_name,
-        'org_address': org_address,
-        'gstin': gstin,
-        'currency_symbol': currency_symbol,
         'tenant_info': tenant_info,
         'room': room,
         'building': room.building,
@@ -240,99 +271,9 @@ def generate_electricity_invoice_pdf(room_id, year, month):
     # Render HTML template
     html_string = render_to_string('core/pdf/electricity_invoice.html', context)
     
-    # Generate PDF
-    font_config = FontConfiguration()
-    html_doc = HTML(string=html_string)
-    
-    css_string = """
-    @page {
-        size: A4;
-        margin: 1cm;
-    }
-    body {
-        font-family: Arial, sans-serif;
-        font-size: 12px;
-        line-height: 1.4;
-    }
-    .header {
-        border-bottom: 2px solid #333;
-        padding-bottom: 10px;
-        margin-bottom: 20px;
-    }
-    .invoice-title {
-        font-size: 24px;
-        font-weight: bold;
-        color: #333;
-    }
-    .invoice-number {
-        font-size: 14px;
-        color: #666;
-    }
-    .org-info {
-        margin-bottom: 20px;
-    }
-    .org-name {
-        font-size: 16px;
-        font-weight: bold;
-        margin-bottom: 5px;
-    }
-    .org-address {
-        color: #666;
-        margin-bottom: 5px;
-    }
-    .gstin {
-        color: #666;
-        font-size: 11px;
-    }
-    .invoice-details {
-        margin-bottom: 20px;
-    }
-    .detail-row {
-        display: flex;
-        margin-bottom: 5px;
-    }
-    .detail-label {
-        font-weight: bold;
-        width: 150px;
-    }
-    .detail-value {
-        flex: 1;
-    }
-    .billing-details {
-        background-color: #f9f9f9;
-        padding: 15px;
-        border-radius: 5px;
-        margin-bottom: 20px;
-    }
-    .billing-row {
-        display: flex;
-        justify-content: space-between;
-        margin-bottom: 8px;
-    }
-    .billing-label {
-        font-weight: bold;
-    }
-    .billing-value {
-        font-weight: bold;
-    }
-    .total-amount {
-        font-size: 18px;
-        color: #333;
-        border-top: 2px solid #333;
-        padding-top: 10px;
-        margin-top: 15px;
-    }
-    .footer {
-        margin-top: 30px;
-        text-align: center;
-        color: #666;
-        font-size: 10px;
-    }
-    """
-    
-    css_doc = CSS(string=css_string, font_config=font_config)
-    
     # Generate PDF bytes
-    pdf_bytes = html_doc.write_pdf(stylesheets=[css_doc], font_config=font_config)
+    pdf_bytes = HTML(string=html_string).write_pdf(
+        stylesheets=[BASE_PDF_CSS, ELECTRICITY_INVOICE_CSS], font_config=FONT_CONFIG
+    )
     
     return pdf_bytes
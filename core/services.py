@@ -11,10 +11,20 @@ This module contains all business logic extracted from views for:
 from decimal import Decimal
 from datetime import date
 from django.db import transaction
+from django.db.models import Sum
 from django.core.exceptions import ValidationError
 from core.models import Lease, Room, RentPayment, Invoice, InvoiceItem
 
 
+ZERO = Decimal('0')
+ONE = Decimal('1')
+
+
+def as_decimal(value):
+    """Return value as a Decimal, converting through str() only when needed."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
 class LeaseService:
     """
     Centralize all lease-related business logic.
@@ -73,10 +83,7 @@ class LeaseService:
             status='active',
         )
         
-        # Room status is auto-updated by Lease.save() 
-        # But let's make it explicit for clarity:
-        room.status = 'occupied'
-        room.save(update_fields=['status'])
+        # Lease.save() has already marked the room occupied
         
         # Create first month's invoice
         current_month = date(start_date.year, start_date.month, 1)
@@ -85,7 +92,7 @@ class LeaseService:
             month=current_month,
             type='rent',
             subtotal=monthly_rent,
-            tax=Decimal('0'),
+            tax=ZERO,
             total=monthly_rent,
             meta={'rent': float(monthly_rent)}
         )
@@ -93,7 +100,7 @@ class LeaseService:
         InvoiceItem.objects.create(
             invoice=invoice,
             label=f"Rent for {current_month.strftime('%B %Y')}",
-            qty=Decimal('1'),
+            qty=ONE,
             rate=monthly_rent,
             amount=monthly_rent
         )
@@ -126,11 +133,8 @@ class LeaseService:
         
         lease.status = 'ended'
         lease.end_date = end_date
-        lease.save()
-        
-        # Update room status
-        lease.room.status = 'vacant'
-        lease.room.save(update_fields=['status'])
+        # Lease.save() also marks the room vacant
+        lease.save(update_fields=['status', 'end_date', 'updated_at'])
         
         return lease
     
@@ -148,19 +152,16 @@ class LeaseService:
         """
         as_of_date = as_of_date or date.today()
         
-        # Get all invoices up to date
-        invoices = Invoice.objects.filter(
-            room=lease.room,
+        # Sum invoices and payments in the database rather than loading rows
+        total_due = Invoice.objects.filter(
+            room_id=lease.room_id,
             month__lte=as_of_date
-        )
-        total_due = sum(inv.total for inv in invoices)
+        ).aggregate(total=Sum('total'))['total'] or ZERO
         
-        # Get all payments
-        payments = RentPayment.objects.filter(
+        total_paid = RentPayment.objects.filter(
             lease=lease,
             paid_on__lte=as_of_date
-        )
-        total_paid = sum(pay.amount for pay in payments)
+        ).aggregate(total=Sum('amount'))['total'] or ZERO
         
         return total_due - total_paid
 
@@ -241,11 +242,11 @@ class PaymentService:
         ).first()
         
         if existing:
-            # Update existing payment
+            # Update existing payment, writing only the changed columns
             existing.amount = amount
             existing.method = method
             existing.paid_on = paid_on
-            existing.save()
+            existing.save(update_fields=['amount', 'method', 'paid_on', 'updated_at'])
             return existing
         else:
             # Create new payment
@@ -273,25 +274,26 @@ class InvoiceService:
             room: Room instance
             month: Date (first day of the month)
             rent_amount: Decimal, monthly rent
-            electricity_units: Optional units consumed
-            electricity_rate: Optional rate per unit
+            electricity_units: Optional units consumed (Decimal preferred;
+                ints and floats are converted)
+            electricity_rate: Optional rate per unit (same as units)
             
         Returns:
             Invoice instance
         """
-        subtotal = rent_amount
-        electricity_amount = Decimal('0')
-        
+        electricity_amount = ZERO
         if electricity_units and electricity_rate:
-            electricity_amount = Decimal(str(electricity_units)) * Decimal(str(electricity_rate))
-            subtotal += electricity_amount
+            units = as_decimal(electricity_units)
+            rate = as_decimal(electricity_rate)
+            electricity_amount = units * rate
+        subtotal = rent_amount + electricity_amount
         
         invoice = Invoice.objects.create(
             room=room,
             month=month,
             type='rent',
             subtotal=subtotal,
-            tax=Decimal('0'),
+            tax=ZERO,
             total=subtotal,
             meta={
                 'rent': float(rent_amount),
@@ -301,23 +303,27 @@ class InvoiceService:
             }
         )
         
-        # Create invoice items
-        InvoiceItem.objects.create(
-            invoice=invoice,
-            label=f"Rent for {month.strftime('%B %Y')}",
-            qty=Decimal('1'),
-            rate=rent_amount,
-            amount=rent_amount
-        )
+        # Create invoice items in one INSERT
+        items = [
+            InvoiceItem(
+                invoice=invoice,
+                label=f"Rent for {month.strftime('%B %Y')}",
+                qty=ONE,
+                rate=rent_amount,
+                amount=rent_amount
+            ),
+        ]
         
         if electricity_amount > 0:
-            InvoiceItem.objects.create(
+            items.append(InvoiceItem(
                 invoice=invoice,
                 label=f"Electricity ({electricity_units} units)",
-                qty=Decimal(str(electricity_units)),
-                rate=Decimal(str(electricity_rate)),
+                qty=units,
+                rate=rate,
                 amount=electricity_amount
-            )
+            ))
+        
+        InvoiceItem.objects.bulk_create(items)
         
         return invoice
 
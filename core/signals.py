@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import Building, Floor, Setting
+
+
+SETTING_CACHE_TIMEOUT = Setting.VALUES_CACHE_TIMEOUT
+SETTING_LIST_CACHE_KEY = 'settings:all'
+ELECTRICITY_RATE_CACHE_KEY = 'settings:electricity_rate_per_unit'
+
+# Bulk writes (queryset.update(), bulk_create) skip the signals below, so
+# table versions also expire on their own after a few seconds
+TABLE_VERSION_TIMEOUT = 10
+
+
+def table_version_cache_key(model):
+    return f'table_version:{model._meta.label_lower}'
+
+
+def clear_setting_cache():
+    """Drop everything cached from the Setting table."""
+    cache.delete_many([
+        Setting.VALUES_CACHE_KEY,
+        SETTING_LIST_CACHE_KEY,
+        ELECTRICITY_RATE_CACHE_KEY,
+        table_version_cache_key(Setting),
+    ])
+
+
+@receiver([post_save, post_delete], sender=Setting)
+def invalidate_setting_cache(sender, **kwargs):
+    """Drop cached settings whenever a setting changes."""
+    clear_setting_cache()
+
+
+@receiver([post_save, post_delete], sender=Building)
+@receiver([post_save, post_delete], sender=Floor)
+def invalidate_table_version(sender, **kwargs):
+    """Drop the cached table version so list ETags change immediately."""
+    cache.delete(table_version_cache_key(sender))
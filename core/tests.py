@@ -1,12 +1,16 @@
 import pytest
 from decimal import Decimal
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import date, datetime
 import json
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
 from core.models import (
     Building, Floor, Room, Tenant, Lease, RentPayment, 
@@ -14,19 +18,55 @@ from core.models import (
 )
 from core.billing.electricity import (
     get_rate, compute_units, compute_bill, get_month_readings,
-    calc_month_bill, validate_monotonic_readings
+    calc_month_bill, calc_month_bills_bulk, cached_month_bill, load_room_readings,
+    bill_from_invoice,
+    validate_monotonic_readings, get_room_billing_summary
+)
+from core import views
+from core.forms import BuildingWithFloorsForm
+try:
+    from core.pdf import invoices as invoice_pdfs
+except (ImportError, OSError):
+    # WeasyPrint loads Pango when imported
+    invoice_pdfs = None
+from core.api.api import (
+    LeaseSerializer, CONCURRENT_READING_ERROR, MONOTONIC_READING_ERROR, UNIQUE_READING_ERROR,
+    BuildingSerializer, InvoiceSerializer, MeterReadingSerializer, RoomSerializer, TenantSerializer,
+    building_values, invoice_values, meter_reading_values, room_values, tenant_values,
+    serialize_buildings_fast, serialize_invoices_fast, serialize_meter_readings_fast,
+    serialize_rooms_fast, serialize_tenants_fast
 )
 
 
-class ElectricityBillingTests(TestCase):
-    """Test electricity billing calculations."""
+def create_readings(room, *readings):
+    """Insert a room's (reading_date, value) pairs with a single query."""
+    return MeterReading.objects.bulk_create([
+        MeterReading(room=room, reading_date=reading_date, reading_value=Decimal(value))
+        for reading_date, value in readings
+    ])
+
+
+class ClearCacheMixin:
+    """Start each test with an empty cache.
+
+    Rows are rolled back after each test, cached values are not.
+    """
     
     def setUp(self):
-        self.building = Building.objects.create(name="Test Building")
-        self.floor = Floor.objects.create(building=self.building, floor_number=1)
-        self.room = Room.objects.create(
-            building=self.building, 
-            floor=self.floor, 
+        cache.clear()
+        super().setUp()
+
+
+class ElectricityBillingTests(ClearCacheMixin, TestCase):
+    """Test electricity billing calculations."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.building = Building.objects.create(name="Test Building")
+        cls.floor = Floor.objects.create(building=cls.building, floor_number=1)
+        cls.room = Room.objects.create(
+            building=cls.building, 
+            floor=cls.floor, 
             room_number="101"
         )
         
@@ -38,12 +78,26 @@ class ElectricityBillingTests(TestCase):
         rate = get_rate()
         self.assertEqual(rate, Decimal('10.50'))
     
+    def test_get_rate_cached_until_setting_changes(self):
+        """Test the rate is served from cache and refreshed on save."""
+        get_rate()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_rate(), Decimal('10.50'))
+        
+        Setting.set_value('electricity_rate_per_unit', '12.00')
+        self.assertEqual(get_rate(), Decimal('12.00'))
+    
     def test_get_rate_default(self):
         """Test getting default rate when setting doesn't exist."""
         Setting.objects.filter(key='electricity_rate_per_unit').delete()
         rate = get_rate()
         self.assertEqual(rate, Decimal('0'))
     
+    def test_get_rate_invalid_value(self):
+        """Test a non-numeric rate setting falls back to zero."""
+        Setting.set_value('electricity_rate_per_unit', 'ten')
+        self.assertEqual(get_rate(), Decimal('0'))
+    
     def test_compute_units_no_previous(self):
         """Test computing units when there's no previous reading."""
         units = compute_units(None, Decimal('100'))
@@ -75,15 +129,10 @@ class ElectricityBillingTests(TestCase):
     def test_get_month_readings(self):
         """Test getting month readings."""
         # Create readings
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 1, 15),
-            reading_value=Decimal('100')
-        )
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 2, 15),
-            reading_value=Decimal('150')
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
         )
         
         previous, current = get_month_readings(self.room.id, 2024, 2)
@@ -93,20 +142,110 @@ class ElectricityBillingTests(TestCase):
     def test_calc_month_bill(self):
         """Test calculating month bill."""
         # Create readings
-        MeterReading.objects.create(
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
+        )
+        
+        bill = calc_month_bill(self.room.id, 2024, 2)
+        self.assertEqual(bill['units'], Decimal('50'))
+        self.assertEqual(bill['total'], Decimal('525'))  # 50 * 10.50
+    
+    def test_bill_from_invoice(self):
+        """Test rebuilding a bill from an issued electricity invoice."""
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
+        )
+        bill = calc_month_bill(self.room.id, 2024, 2)
+        invoice = Invoice.objects.create(
             room=self.room,
-            reading_date=date(2024, 1, 15),
-            reading_value=Decimal('100')
+            month=date(2024, 2, 1),
+            type='electricity',
+            subtotal=bill['total'],
+            total=bill['total'],
+            meta={
+                'previous_reading': float(bill['previous_reading']),
+                'current_reading': float(bill['current_reading']),
+                'units': float(bill['units']),
+                'rate': float(bill['rate'])
+            }
         )
-        MeterReading.objects.create(
+        
+        stored = bill_from_invoice(invoice)
+        for key in ('month', 'previous_reading', 'current_reading', 'units', 'rate', 'total'):
+            self.assertEqual(stored[key], bill[key])
+        
+        invoice.meta = {}
+        self.assertIsNone(bill_from_invoice(invoice))
+    
+    def test_calc_month_bills_bulk(self):
+        """Test calculating month bills for several rooms at once."""
+        other_room = Room.objects.create(
+            building=self.building,
+            floor=self.floor,
+            room_number="102"
+        )
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
+        )
+        create_readings(
+            other_room,
+            (date(2024, 1, 15), '200'),
+            (date(2024, 2, 15), '220'),
+        )
+        
+        with self.assertNumQueries(2):
+            bills = calc_month_bills_bulk([self.room.id, other_room.id, 9999], 2024, 2)
+        
+        self.assertEqual(set(bills), {self.room.id, other_room.id})
+        self.assertEqual(bills[self.room.id]['units'], Decimal('50'))
+        self.assertEqual(bills[other_room.id]['units'], Decimal('20'))
+        self.assertEqual(bills[other_room.id]['total'], Decimal('210.00'))
+    
+    def test_get_room_billing_summary(self):
+        """Test the billing summary combines rent and electricity."""
+        tenant = Tenant.objects.create(full_name="Test Tenant", phone="1234567890")
+        Lease.objects.create(
+            tenant=tenant,
             room=self.room,
-            reading_date=date(2024, 2, 15),
-            reading_value=Decimal('150')
+            start_date=date(2024, 1, 1),
+            monthly_rent=Decimal('5000')
+        )
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
         )
+        get_rate()
         
-        bill = calc_month_bill(self.room.id, 2024, 2)
+        with self.assertNumQueries(2):
+            summary = get_room_billing_summary(self.room.id, 2024, 2)
+        
+        self.assertEqual(summary['rent_due'], Decimal('5000'))
+        self.assertEqual(summary['electricity']['units'], Decimal('50'))
+        self.assertEqual(summary['total_due'], Decimal('5525.00'))
+    
+    def test_cached_month_bill_tracks_reading_changes(self):
+        """Test cached bill is recomputed when a reading changes."""
+        _, current = create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
+        )
+        
+        bill = cached_month_bill(self.room.id, 2024, 2)
         self.assertEqual(bill['units'], Decimal('50'))
-        self.assertEqual(bill['total'], Decimal('525'))  # 50 * 10.50
+        
+        current.reading_value = Decimal('160')
+        current.save()
+        
+        bill = cached_month_bill(self.room.id, 2024, 2)
+        self.assertEqual(bill['units'], Decimal('60'))
     
     def test_validate_monotonic_readings(self):
         """Test validating monotonic readings."""
@@ -126,52 +265,83 @@ class ElectricityBillingTests(TestCase):
         self.assertFalse(validate_monotonic_readings(
             self.room.id, date(2024, 2, 15), Decimal('50')
         ))
+    
+    def test_validate_monotonic_readings_preloaded(self):
+        """Test validating against readings loaded up front."""
+        MeterReading.objects.create(
+            room=self.room,
+            reading_date=date(2024, 1, 15),
+            reading_value=Decimal('100')
+        )
+        readings_by_room = load_room_readings([self.room.id])
+        
+        with self.assertNumQueries(0):
+            self.assertTrue(validate_monotonic_readings(
+                self.room.id, date(2024, 2, 15), Decimal('150'), readings_by_room
+            ))
+            self.assertFalse(validate_monotonic_readings(
+                self.room.id, date(2024, 2, 15), Decimal('50'), readings_by_room
+            ))
 
 
-class APITests(APITestCase):
+class APITests(ClearCacheMixin, APITestCase):
     """Test API endpoints."""
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123',
             is_staff=True
         )
-        self.client.force_authenticate(user=self.user)
         
-        self.building = Building.objects.create(name="Test Building")
-        self.floor = Floor.objects.create(building=self.building, floor_number=1)
-        self.room = Room.objects.create(
-            building=self.building, 
-            floor=self.floor, 
+        cls.building = Building.objects.create(name="Test Building")
+        cls.floor = Floor.objects.create(building=cls.building, floor_number=1)
+        cls.room = Room.objects.create(
+            building=cls.building, 
+            floor=cls.floor, 
             room_number="101"
         )
-        self.tenant = Tenant.objects.create(
+        cls.tenant = Tenant.objects.create(
             full_name="Test Tenant",
             phone="1234567890",
             email="test@example.com"
         )
-        self.lease = Lease.objects.create(
-            tenant=self.tenant,
-            room=self.room,
+        cls.lease = Lease.objects.create(
+            tenant=cls.tenant,
+            room=cls.room,
             start_date=date(2024, 1, 1),
             monthly_rent=Decimal('5000'),
             billing_day=1
         )
     
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+    
     def test_room_list(self):
         """Test room list API."""
+        # More rooms than the fixture's one, so a per-room query would show
+        Room.objects.bulk_create([
+            Room(building=self.building, floor=self.floor, room_number=number)
+            for number in ('102', '103')
+        ])
         url = reverse('room-list')
-        response = self.client.get(url)
+        # Count, page rows and one batched active-lease lookup; nothing per room
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
     
     def test_room_list_filter(self):
         """Test room list with filters."""
         url = reverse('room-list')
-        response = self.client.get(url, {'building': self.building.id})
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'building': self.building.id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
     
     def test_meter_reading_create(self):
         """Test creating meter reading."""
@@ -204,18 +374,149 @@ class APITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(MeterReading.objects.count(), 2)
     
+    def test_fast_room_and_reading_serializers_match(self):
+        """Test the .values() room and reading renderers match their serializers."""
+        reading, = create_readings(self.room, (date(2024, 1, 15), '100.5'))
+        
+        rooms = Room.objects.filter(id=self.room.id)
+        self.assertEqual(
+            serialize_rooms_fast(room_values(rooms)),
+            [RoomSerializer(rooms.get()).data]
+        )
+        
+        readings = MeterReading.objects.filter(id=reading.id)
+        self.assertEqual(
+            serialize_meter_readings_fast(meter_reading_values(readings)),
+            [MeterReadingSerializer(readings.get()).data]
+        )
+    
+    def test_fast_building_tenant_invoice_serializers_match(self):
+        """Test the .values() building, tenant and invoice renderers match their serializers."""
+        invoice = Invoice.objects.create(
+            room=self.room,
+            month=date(2024, 2, 1),
+            type='rent',
+            subtotal=Decimal('5000'),
+            tax=Decimal('0'),
+            total=Decimal('5000'),
+            meta={'lease_id': self.lease.id}
+        )
+        InvoiceItem.objects.create(
+            invoice=invoice,
+            label='Rent for 2024-02',
+            qty=Decimal('1'),
+            rate=Decimal('5000'),
+            amount=Decimal('5000')
+        )
+        
+        buildings = Building.objects.filter(id=self.building.id)
+        self.assertEqual(
+            serialize_buildings_fast(building_values(buildings)),
+            [BuildingSerializer(buildings.get()).data]
+        )
+        
+        tenants = Tenant.objects.filter(id=self.tenant.id)
+        self.assertEqual(
+            serialize_tenants_fast(tenant_values(tenants)),
+            [TenantSerializer(tenants.get()).data]
+        )
+        
+        invoices = Invoice.objects.filter(id=invoice.id)
+        self.assertEqual(
+            serialize_invoices_fast(invoice_values(invoices)),
+            [InvoiceSerializer(invoices.get()).data]
+        )
+    
+    def test_meter_reading_bulk_duplicate_date(self):
+        """Test a reading date repeated within one request is rejected."""
+        url = reverse('meter-reading-bulk')
+        data = [
+            {'room': self.room.id, 'reading_date': '2024-01-15', 'reading_value': '100.00'},
+            {'room': self.room.id, 'reading_date': '2024-01-15', 'reading_value': '120.00'},
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertEqual(
+            response.data['errors'][0]['error'],
+            {'non_field_errors': [UNIQUE_READING_ERROR]}
+        )
+        self.assertEqual(
+            list(MeterReading.objects.values_list('reading_value', flat=True)),
+            [Decimal('100.00')]
+        )
+    
+    def test_meter_reading_bulk_decreasing_value(self):
+        """Test values below an earlier stored or submitted reading are rejected."""
+        create_readings(self.room, (date(2024, 1, 15), '100'))
+        url = reverse('meter-reading-bulk')
+        data = [
+            # Below the stored January reading
+            {'room': self.room.id, 'reading_date': '2024-02-15', 'reading_value': '90.00'},
+            {'room': self.room.id, 'reading_date': '2024-03-15', 'reading_value': '150.00'},
+            # Below the March reading accepted earlier in this request
+            {'room': self.room.id, 'reading_date': '2024-04-15', 'reading_value': '140.00'},
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['index'] for error in response.data['errors']], [0, 2])
+        for error in response.data['errors']:
+            self.assertEqual(error['error'], {'non_field_errors': [MONOTONIC_READING_ERROR]})
+        self.assertEqual(
+            list(MeterReading.objects.order_by('reading_date').values_list('reading_date', flat=True)),
+            [date(2024, 1, 15), date(2024, 3, 15)]
+        )
+    
+    def test_meter_reading_bulk_mixed_rows(self):
+        """Test valid rows are stored and invalid ones reported in index order."""
+        url = reverse('meter-reading-bulk')
+        data = [
+            {'room': self.room.id, 'reading_date': '2024-01-15', 'reading_value': '100.00'},
+            {'room': 9999, 'reading_date': '2024-01-15', 'reading_value': '100.00'},
+            {'room': self.room.id, 'reading_date': '2024-02-15', 'reading_value': '50.00'},
+            {'room': self.room.id, 'reading_date': '2024-03-15', 'reading_value': '130.00'},
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], 2)
+        errors = response.data['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 2])
+        self.assertIn('room', errors[0]['error'])
+        self.assertEqual(errors[0]['data'], data[1])
+        self.assertEqual(errors[1]['error'], {'non_field_errors': [MONOTONIC_READING_ERROR]})
+        self.assertEqual(
+            list(MeterReading.objects.order_by('reading_date').values_list('reading_value', flat=True)),
+            [Decimal('100.00'), Decimal('130.00')]
+        )
+    
+    def test_meter_reading_bulk_concurrent_clash(self):
+        """Test a reading saved after the pre-load gives a 400, not a 500."""
+        create_readings(self.room, (date(2024, 1, 15), '100'))
+        url = reverse('meter-reading-bulk')
+        data = [
+            {'room': self.room.id, 'reading_date': '2024-02-15', 'reading_value': '150.00'},
+            {'room': self.room.id, 'reading_date': '2024-01-15', 'reading_value': '100.00'},
+        ]
+        # Pretend the January reading arrived after the existing readings were loaded
+        with mock.patch(
+            'core.api.api.load_room_readings',
+            side_effect=lambda room_ids: {room_id: {} for room_id in room_ids}
+        ):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], CONCURRENT_READING_ERROR)
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual(MeterReading.objects.count(), 1)
+    
     def test_electricity_bill_calc(self):
         """Test electricity bill calculation."""
         # Create readings
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 1, 15),
-            reading_value=Decimal('100')
-        )
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 2, 15),
-            reading_value=Decimal('150')
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
         )
         
         # Set rate
@@ -234,15 +535,10 @@ class APITests(APITestCase):
     def test_electricity_invoice_create(self):
         """Test creating electricity invoice."""
         # Create readings
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 1, 15),
-            reading_value=Decimal('100')
-        )
-        MeterReading.objects.create(
-            room=self.room,
-            reading_date=date(2024, 2, 15),
-            reading_value=Decimal('150')
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
         )
         
         # Set rate
@@ -257,39 +553,188 @@ class APITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Invoice.objects.count(), 1)
         self.assertEqual(InvoiceItem.objects.count(), 1)
+    
+    def test_electricity_invoice_create_existing(self):
+        """Test an invoiced month returns the invoice even if it no longer bills."""
+        create_readings(
+            self.room,
+            (date(2024, 1, 15), '100'),
+            (date(2024, 2, 15), '150'),
+        )
+        Setting.objects.create(key='electricity_rate_per_unit', value='10.50')
+        
+        url = reverse('electricity-invoice-create')
+        data = {
+            'room_id': self.room.id,
+            'month': '2024-02'
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        # A February reading below January's makes the bill itself an error
+        MeterReading.objects.filter(reading_date=date(2024, 2, 15)).update(reading_value=Decimal('90'))
+        cache.clear()
+        
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Invoice already exists')
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(InvoiceItem.objects.count(), 1)
+    
+    def test_rent_invoice_create_existing(self):
+        """Test creating a rent invoice twice returns the existing one."""
+        url = reverse('rent-invoice-create')
+        data = {
+            'lease_id': self.lease.id,
+            'month': '2024-02'
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'Invoice already exists')
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(InvoiceItem.objects.count(), 1)
+    
+    def test_lease_partial_update_end_date_validation(self):
+        """Test a partial update with only end_date is checked against start_date."""
+        serializer = LeaseSerializer(
+            self.lease, data={'end_date': '2023-12-31'}, partial=True
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
+        
+        serializer = LeaseSerializer(
+            self.lease, data={'end_date': '2024-12-31'}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+    
+    def test_setting_list_cache_invalidated_on_save(self):
+        """Test the cached settings list is refreshed when a setting changes."""
+        url = reverse('setting-list')
+        Setting.set_value('electricity_rate_per_unit', '8.50')
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['value'], '8.50')
+        
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        
+        self.client.post(url, {'key': 'electricity_rate_per_unit', 'value': '9.00'})
+        response = self.client.get(url)
+        self.assertEqual(response.data[0]['value'], '9.00')
+
+    def test_tenant_validate(self):
+        """Test tenant form validation reports errors without saving."""
+        url = reverse('tenant-validate')
+        tenant_count = Tenant.objects.count()
+
+        response = self.client.post(url, {'full_name': 'New Tenant', 'phone': '5550001111'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['valid'])
+
+        response = self.client.post(url, {'full_name': 'New Tenant', 'phone': '5550001111',
+                                          'room': self.room.id})
+        self.assertFalse(response.data['valid'])
+        self.assertIn('room', response.data['errors'])
+        self.assertEqual(Tenant.objects.count(), tenant_count)
+
+    def test_building_list_etag(self):
+        """Test an unchanged building list is answered with 304 Not Modified."""
+        url = reverse('building-list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.building.name = 'Renamed Building'
+        self.building.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
 
+    def test_floor_list_etag(self):
+        """Test the floor list tag only follows the floor table and varies on Accept."""
+        url = reverse('floor-list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Accept', response['Vary'])
+
+        # Floors only carry the building id, so a renamed building keeps the tag
+        self.building.name = 'Renamed Building'
+        self.building.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('Accept', response['Vary'])
+
+        self.floor.floor_number = 2
+        self.floor.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
 
-class ViewTests(TestCase):
+
+class ViewTests(ClearCacheMixin, TestCase):
     """Test HTMX views."""
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123',
             is_staff=True
         )
-        self.client.force_login(self.user)
         
-        self.building = Building.objects.create(name="Test Building")
-        self.floor = Floor.objects.create(building=self.building, floor_number=1)
-        self.room = Room.objects.create(
-            building=self.building, 
-            floor=self.floor, 
+        cls.building = Building.objects.create(name="Test Building")
+        cls.floor = Floor.objects.create(building=cls.building, floor_number=1)
+        cls.room = Room.objects.create(
+            building=cls.building, 
+            floor=cls.floor, 
             room_number="101"
         )
     
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+    
+    def get_view(self, view, url_name):
+        """Call a read-only view directly, skipping the middleware stack."""
+        request = RequestFactory().get(reverse(url_name))
+        request.user = self.user
+        return view(request)
+    
     def test_dashboard_view(self):
         """Test dashboard view."""
-        response = self.client.get(reverse('dashboard'))
+        response = self.get_view(views.dashboard, 'dashboard')
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Dashboard')
     
     def test_map_view(self):
         """Test map view."""
-        response = self.client.get(reverse('map'))
+        response = self.get_view(views.map_view, 'map')
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Room Map')
-    
+
+    def test_create_building(self):
+        """Test creating a building with its floors and rooms in one go."""
+        response = self.client.post(reverse('create_building'), {
+            'building_name': 'Tower B',
+            'num_floors': 2,
+            'rooms_per_floor': 3,
+            'room_number_prefix': 'B',
+        })
+        self.assertRedirects(response, reverse('map'))
+
+        building = Building.objects.get(name='Tower B')
+        self.assertEqual(building.floors.count(), 2)
+        self.assertEqual(
+            list(building.rooms.values_list('room_number', flat=True)),
+            ['B001', 'B002', 'B003', 'B101', 'B102', 'B103']
+        )
+        self.assertEqual(Room.history.filter(building_id=building.id).count(), 6)
+
     def test_room_drawer(self):
         """Test room drawer HTMX view."""
         response = self.client.get(reverse('room_drawer', args=[self.room.id]))
@@ -303,18 +748,19 @@ class ViewTests(TestCase):
         self.assertContains(response, 'Settings')
 
 
-class ModelTests(TestCase):
+class ModelTests(ClearCacheMixin, TestCase):
     """Test model functionality."""
     
-    def setUp(self):
-        self.building = Building.objects.create(name="Test Building")
-        self.floor = Floor.objects.create(building=self.building, floor_number=1)
-        self.room = Room.objects.create(
-            building=self.building, 
-            floor=self.floor, 
+    @classmethod
+    def setUpTestData(cls):
+        cls.building = Building.objects.create(name="Test Building")
+        cls.floor = Floor.objects.create(building=cls.building, floor_number=1)
+        cls.room = Room.objects.create(
+            building=cls.building, 
+            floor=cls.floor, 
             room_number="101"
         )
-        self.tenant = Tenant.objects.create(
+        cls.tenant = Tenant.objects.create(
             full_name="Test Tenant",
             phone="1234567890",
             email="test@example.com"
@@ -361,7 +807,19 @@ class ModelTests(TestCase):
         # Get default value
         default_value = Setting.get_value('nonexistent_key', 'default')
         self.assertEqual(default_value, 'default')
-    
+
+    def test_setting_get_value_cached(self):
+        """Test setting values are read from cache until a setting changes."""
+        Setting.set_value('org_name', 'Acme')
+        Setting.get_value('org_name')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Setting.get_value('org_name'), 'Acme')
+            self.assertIsNone(Setting.get_value('gstin'))
+
+        Setting.set_value('org_name', 'Acme Rentals')
+        self.assertEqual(Setting.get_value('org_name'), 'Acme Rentals')
+
     def test_meter_reading_unique_constraint(self):
         """Test meter reading unique constraint."""
         MeterReading.objects.create(
@@ -377,3 +835,101 @@ class ModelTests(TestCase):
                 reading_date=date(2024, 1, 15),
                 reading_value=Decimal('150')
             )
+    
+    def test_lease_bulk_create_active(self):
+        """Test bulk lease creation occupies rooms and rejects taken rooms."""
+        other_room = Room.objects.create(
+            building=self.building,
+            floor=self.floor,
+            room_number="102"
+        )
+        leases = Lease.bulk_create_active([
+            Lease(tenant=self.tenant, room=room, start_date=date(2024, 1, 1),
+                  monthly_rent=Decimal('5000'))
+            for room in (self.room, other_room)
+        ])
+        
+        self.assertTrue(all(lease.pk for lease in leases))
+        self.assertEqual(
+            set(Room.objects.values_list('status', flat=True)), {'occupied'}
+        )
+        self.assertEqual(Room.history.filter(id=self.room.id).first().status, 'occupied')
+        
+        with self.assertRaises(ValidationError):
+            Lease.bulk_create_active([
+                Lease(tenant=self.tenant, room=self.room, start_date=date(2024, 6, 1),
+                      monthly_rent=Decimal('5000'))
+            ])
+    
+    def test_lease_duplicate_active_rejected(self):
+        """Test the active-lease constraint surfaces as a ValidationError."""
+        Lease.objects.create(
+            tenant=self.tenant,
+            room=self.room,
+            start_date=date(2024, 1, 1),
+            monthly_rent=Decimal('5000')
+        )
+        
+        with self.assertRaisesMessage(ValidationError, 'already has an active lease'):
+            Lease.objects.create(
+                tenant=self.tenant,
+                room=self.room,
+                start_date=date(2024, 6, 1),
+                monthly_rent=Decimal('6000')
+            )
+        self.assertEqual(Lease.objects.filter(room=self.room).count(), 1)
+    
+    def test_building_form_rejects_duplicate_name(self):
+        """Test the building name check is case-insensitive, non-ASCII names included."""
+        Building.objects.create(name="Ärzte Haus")
+        for name in ("test building", "Ärzte Haus"):
+            form = BuildingWithFloorsForm(data={
+                'building_name': name, 'num_floors': 1, 'rooms_per_floor': 1
+            })
+            self.assertFalse(form.is_valid())
+            self.assertIn('building_name', form.errors)
+
+
+@skipUnless(invoice_pdfs, 'WeasyPrint is not available')
+class InvoicePdfTests(ClearCacheMixin, TestCase):
+    """Test invoice PDF generation."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        building = Building.objects.create(name="Test Building")
+        floor = Floor.objects.create(building=building, floor_number=1)
+        cls.room = Room.objects.create(building=building, floor=floor, room_number="101")
+        cls.invoices = [
+            Invoice.objects.create(
+                room=cls.room,
+                month=date(2024, month, 1),
+                type='rent',
+                subtotal=Decimal('5000'),
+                tax=Decimal('0'),
+                total=Decimal('5000')
+            )
+            for month in (1, 2)
+        ]
+    
+    def test_generate_invoices_pdf_batch_splits_pages(self):
+        """Test batch pages are split per invoice at each invoice's anchor."""
+        first, second = self.invoices
+        pages = [
+            SimpleNamespace(anchors={}),
+            SimpleNamespace(anchors={f'invoice-{first.id}': None}),
+            SimpleNamespace(anchors={}),
+            SimpleNamespace(anchors={'totals': None, f'invoice-{second.id}': None}),
+        ]
+        document = mock.Mock(pages=pages)
+        # Stand in for the PDF bytes with the pages copied for each invoice
+        document.copy.side_effect = lambda copied: SimpleNamespace(write_pdf=lambda: copied)
+        
+        with mock.patch.object(invoice_pdfs, 'HTML') as html:
+            html.return_value.render.return_value = document
+            pdfs = invoice_pdfs.generate_invoices_pdf_batch([first.id, second.id, 9999])
+        
+        self.assertEqual(html.return_value.render.call_count, 1)
+        self.assertEqual(pdfs, {
+            first.id: [pages[1], pages[2]],
+            second.id: [pages[3]],
+        })
@@ -1,6 +1,34 @@
-from django.urls import path
+from django.urls import include, path
 from . import views
 
+# Routes under one object prefix are grouped, so the resolver matches the
+# prefix once instead of trying every per-object route in turn
+
+# room/<room_id>/...
+room_patterns = [
+    path('', views.room_details_page, name='room_details_page'),
+    path('panel/', views.room_panel, name='room_panel'),
+    path('status/<str:new_status>/', views.update_room_status, name='update_room_status'),
+    path('update-payment/', views.update_payment_status, name='update_payment_status'),
+    path('add-meter-reading/', views.add_meter_reading_inline, name='add_meter_reading_inline'),
+    path('create-lease/', views.create_lease_for_room, name='create_lease_for_room'),
+]
+
+# rooms/<room_id>/...
+rooms_partial_patterns = [
+    path('drawer/', views.room_drawer, name='room_drawer'),
+    path('add-reading/', views.add_meter_reading, name='add_meter_reading'),
+    path('compute-bill/', views.compute_electricity_bill, name='compute_electricity_bill'),
+    path('generate-invoice/', views.generate_electricity_invoice, name='generate_electricity_invoice'),
+]
+
+# lease/<lease_id>/...
+lease_patterns = [
+    path('bill/create/', views.create_bill, name='create_bill'),
+    path('update-tenant/', views.update_lease_tenant, name='update_lease_tenant'),
+    path('update-rent/', views.update_lease_rent, name='update_lease_rent'),
+]
+
 urlpatterns = [
     # Authentication
     path('login/', views.login_view, name='login'),
@@ -23,26 +51,12 @@ urlpatterns = [
     path('building/<int:building_id>/', views.building_details, name='building_details'),
     path('building/<int:building_id>/floor/<int:floor_index>/', views.building_floor_partial, name='building_floor_partial'),
     
-    # Room details (full page)
-    path('room/<int:room_id>/', views.room_details_page, name='room_details_page'),
-    
-    # HTMX partials
-    path('rooms/<int:room_id>/drawer/', views.room_drawer, name='room_drawer'),
-    path('room/<int:room_id>/panel/', views.room_panel, name='room_panel'),
-    path('room/<int:room_id>/status/<str:new_status>/', views.update_room_status, name='update_room_status'),
-    path('rooms/<int:room_id>/add-reading/', views.add_meter_reading, name='add_meter_reading'),
+    # Room page, HTMX partials and inline editing
+    path('room/<int:room_id>/', include(room_patterns)),
+    path('rooms/<int:room_id>/', include(rooms_partial_patterns)),
+    path('lease/<int:lease_id>/', include(lease_patterns)),
     path('leases/<int:lease_id>/record-payment/', views.record_rent_payment, name='record_rent_payment'),
-    path('lease/<int:lease_id>/bill/create/', views.create_bill, name='create_bill'),
     path('invoice/<int:invoice_id>/status/<str:status>/', views.set_bill_status, name='set_bill_status'),
-    path('rooms/<int:room_id>/compute-bill/', views.compute_electricity_bill, name='compute_electricity_bill'),
-    path('rooms/<int:room_id>/generate-invoice/', views.generate_electricity_invoice, name='generate_electricity_invoice'),
-    
-    # Inline editing
-    path('lease/<int:lease_id>/update-tenant/', views.update_lease_tenant, name='update_lease_tenant'),
-    path('lease/<int:lease_id>/update-rent/', views.update_lease_rent, name='update_lease_rent'),
-    path('room/<int:room_id>/update-payment/', views.update_payment_status, name='update_payment_status'),
-    path('room/<int:room_id>/add-meter-reading/', views.add_meter_reading_inline, name='add_meter_reading_inline'),
-    path('room/<int:room_id>/create-lease/', views.create_lease_for_room, name='create_lease_for_room'),
     
     # Reports
     path('reports/rent-collection/', views.reports_rent_collection, name='reports_rent_collection'),
@@ -8,6 +8,7 @@ from django.views.decorators.http import require_http_methods
 from django.db.models import Q, Sum, Count
 from django.db import transaction
 from django.utils import timezone
+from simple_history.utils import bulk_create_with_history
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import json
@@ -16,7 +17,9 @@ from .models import (
     Building, Floor, Room, Tenant, Lease, RentPayment, 
     MeterReading, Invoice, InvoiceItem, Setting
 )
-from .billing.electricity import calc_month_bill, get_room_billing_summary
+from .billing.electricity import (
+    calc_month_bill, get_rate, get_room_billing_summary, parse_month, month_bounds
+)
 from .forms import (
     BuildingForm, FloorForm, RoomForm, TenantForm, LeaseForm, 
     RentPaymentForm, MeterReadingForm, SettingForm
@@ -219,27 +222,29 @@ def create_building(request):
                     rooms_per_floor = form.cleaned_data['rooms_per_floor']
                     room_prefix = form.cleaned_data.get('room_number_prefix', '')
                     
-                    # Create floors and rooms
-                    for floor_num in range(num_floors):
-                        floor = Floor.objects.create(
+                    # Create floors and rooms with one batched INSERT per table
+                    floors = Floor.objects.bulk_create([
+                        Floor(building=building, floor_number=floor_num)
+                        for floor_num in range(num_floors)
+                    ])
+                    
+                    # Generate room number: floor_num + room_num (e.g., 101, 102, 201, 202)
+                    rooms = [
+                        Room(
                             building=building,
-                            floor_number=floor_num
+                            floor=floor,
+                            room_number=f"{room_prefix}{floor.floor_number}{room_num:02d}",
+                            status='vacant'
                         )
-                        
-                        # Create rooms for this floor
-                        for room_num in range(1, rooms_per_floor + 1):
-                            # Generate room number: floor_num + room_num (e.g., 101, 102, 201, 202)
-                            if room_prefix:
-                                room_number = f"{room_prefix}{floor_num}{room_num:02d}"
-                            else:
-                                room_number = f"{floor_num}{room_num:02d}"
-                            
-                            Room.objects.create(
-                                building=building,
-                                floor=floor,
-                                room_number=room_number,
-                                status='vacant'
-                            )
+                        for floor in floors
+                        for room_num in range(1, rooms_per_floor + 1)
+                    ]
+                    bulk_create_with_history(
+                        rooms,
+                        Room,
+                        batch_size=500,
+                        default_user=request.user
+                    )
                     
                     messages.success(
                         request,
@@ -265,9 +270,12 @@ def create_building(request):
 
 @login_required
 def map_view(request):
-    buildings = Building.objects.all()
-    floors = Floor.objects.all()
-    rooms = Room.objects.all()
+    buildings = Building.objects.annotate(
+        floor_count=Count('floors', distinct=True),
+        room_count=Count('rooms', distinct=True),
+    )
+    floors = Floor.objects.select_related('building')
+    rooms = Room.objects.select_related('building', 'floor')
     
     # Get selected building and floor from query params
     selected_building = request.GET.get('building')
@@ -386,7 +394,7 @@ def tenant_edit(request, tenant_id):
 
 @login_required
 def leases_view(request):
-    leases = Lease.objects.all()
+    leases = Lease.objects.select_related('tenant', 'room__building', 'room__floor')
     
     if request.method == 'POST':
         form = LeaseForm(request.POST)
@@ -407,7 +415,9 @@ def leases_view(request):
 
 @login_required
 def payments_view(request):
-    payments = RentPayment.objects.all()
+    payments = RentPayment.objects.select_related(
+        'lease__tenant', 'lease__room__building', 'lease__room__floor'
+    )
     
     if request.method == 'POST':
         form = RentPaymentForm(request.POST)
@@ -428,22 +438,25 @@ def payments_view(request):
 
 @login_required
 def meter_bulk_view(request):
-    rooms = Room.objects.all()
-    current_month = timezone.now().date().replace(day=1)
-    
-    # Get readings for current month
-    readings = {}
-    for room in rooms:
-        reading = room.meter_readings.filter(
-            reading_date__gte=current_month,
-            reading_date__lt=current_month + timedelta(days=32)
-        ).order_by('-reading_date').first()
-        readings[room.id] = reading
+    rooms = Room.objects.select_related('building')
+    today = timezone.now().date()
+    current_month, next_month = month_bounds(today.year, today.month)
+    
+    # Get the latest reading of the current month for every room in one
+    # query; ascending order lets the last reading per room win
+    readings = {room.id: None for room in rooms}
+    month_readings = MeterReading.objects.filter(
+        reading_date__gte=current_month,
+        reading_date__lt=next_month
+    ).order_by('room_id', 'reading_date')
+    for reading in month_readings:
+        readings[reading.room_id] = reading
     
     context = {
         'rooms': rooms,
         'readings': readings,
         'current_month': current_month,
+        'electricity_rate': get_rate(),
     }
     
     return render(request, 'core/meter_bulk.html', context)
@@ -451,7 +464,7 @@ def meter_bulk_view(request):
 
 @login_required
 def billing_view(request):
-    rooms = Room.objects.all()
+    rooms = Room.objects.select_related('building')
     
     context = {
         'rooms': rooms,
@@ -534,8 +547,8 @@ def compute_electricity_bill(request, room_id):
     month_str = request.GET.get('month', timezone.now().strftime('%Y-%m'))
     
     try:
-        year, month = map(int, month_str.split('-'))
-        bill_data = calc_month_bill(room_id, year, month)
+        first_of_month = parse_month(month_str)
+        bill_data = calc_month_bill(room_id, first_of_month.year, first_of_month.month)
         
         return render(request, 'core/partials/electricity_bill.html', {
             'room': room,
@@ -556,8 +569,8 @@ def generate_electricity_invoice(request, room_id):
     month_str = request.GET.get('month', timezone.now().strftime('%Y-%m'))
     
     try:
-        year, month = map(int, month_str.split('-'))
-        first_of_month = date(year, month, 1)
+        first_of_month = parse_month(month_str)
+        year, month = first_of_month.year, first_of_month.month
         
         # Check if invoice already exists
         existing_invoice = Invoice.objects.filter(
@@ -633,13 +646,13 @@ def reports_rent_collection(request):
     month_str = request.GET.get('month', timezone.now().strftime('%Y-%m'))
     
     try:
-        year, month = map(int, month_str.split('-'))
-        first_of_month = date(year, month, 1)
+        first_of_month = parse_month(month_str)
+        _, first_of_next_month = month_bounds(first_of_month.year, first_of_month.month)
         
         # Get rent payments for the month
         payments = RentPayment.objects.filter(
             paid_on__gte=first_of_month,
-            paid_on__lt=first_of_month + timedelta(days=32)
+            paid_on__lt=first_of_next_month
         )
         
         total = sum(payment.amount for payment in payments)
@@ -665,11 +678,11 @@ def reports_electricity(request):
     month_str = request.GET.get('month', timezone.now().strftime('%Y-%m'))
     
     try:
-        year, month = map(int, month_str.split('-'))
+        first_of_month = parse_month(month_str)
         
         # Get electricity invoices for the month
         invoices = Invoice.objects.filter(
-            month=date(year, month, 1),
+            month=first_of_month,
             type='electricity'
         )
         
@@ -872,8 +885,9 @@ def room_panel(request, room_id, template='core/partials/room_panel.html'):
             })
     
     # Get meter readings (latest 2)
-    latest_reading = room.meter_readings.order_by('-reading_date').first()
-    previous_reading = room.meter_readings.order_by('-reading_date')[1] if room.meter_readings.count() > 1 else None
+    recent_readings = list(room.meter_readings.order_by('-reading_date')[:2])
+    latest_reading = recent_readings[0] if recent_readings else None
+    previous_reading = recent_readings[1] if len(recent_readings) > 1 else None
     
     units_used = None
     if latest_reading and previous_reading:
@@ -946,8 +960,7 @@ def create_bill(request, lease_id):
         elec_amount = request.POST.get('elec_amount', '0')
         
         # Parse period
-        year, month = map(int, period_str.split('-'))
-        first_of_month = date(year, month, 1)
+        first_of_month = parse_month(period_str)
         
         # Calculate total
         elec_amount_decimal = Decimal(elec_amount) if elec_amount else Decimal('0')
@@ -10,7 +10,9 @@ env = environ.Env(
     DEBUG=(bool, False),
     SECRET_KEY=(str, 'django-insecure-change-me-in-production'),
     DATABASE_URL=(str, 'sqlite:///db.sqlite3'),
+    CACHE_URL=(str, 'locmemcache://'),
     ALLOWED_HOSTS=(list, ['localhost', '127.0.0.1']),
+    CSRF_TRUSTED_ORIGINS=(list, ['http://localhost:8000', 'http://127.0.0.1:8000']),
 )
 
 # Read .env file
@@ -28,11 +30,12 @@ ALLOWED_HOSTS = env('ALLOWED_HOSTS')
 if DEBUG:
     ALLOWED_HOSTS += ['.ngrok-free.app', '.ngrok.io']
 
-# CSRF trusted origins (dynamically updated by NgrokCSRFMiddleware for ngrok)
-CSRF_TRUSTED_ORIGINS = [
-    'http://localhost:8000',
-    'http://127.0.0.1:8000',
-]
+# CSRF trusted origins, fixed at startup
+CSRF_TRUSTED_ORIGINS = env('CSRF_TRUSTED_ORIGINS')
+
+# Trust any ngrok tunnel's origin; CsrfViewMiddleware matches the wildcards
+if DEBUG:
+    CSRF_TRUSTED_ORIGINS += ['https://*.ngrok-free.app', 'https://*.ngrok.io']
 
 # Application definition
 INSTALLED_APPS = [
@@ -51,7 +54,6 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'core.middleware.NgrokCSRFMiddleware',  # Handle ngrok CSRF
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -90,6 +92,14 @@ DATABASES = {
     'default': env.db()
 }
 
+# Cache
+# The default local-memory cache is per process, so with several workers a
+# signal only clears the cache of the worker that saved the change. Point
+# CACHE_URL at a shared backend (e.g. dbcache://, memcache://, redis://) there.
+CACHES = {
+    'default': env.cache()
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -140,7 +150,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20,
+    'PAGE_SIZE': 50,
 }
 
 # Login URLs